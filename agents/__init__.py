@@ -1,63 +1,59 @@
-"""Multi-domain research agents package."""
-
-from .base_agent import BaseAgent
-from .statistics_agent import StatisticsAgent
-from .biology_agent import BiologyAgent
-from .psychology_agent import PsychologyAgent
-from .philosophy_agent import PhilosophyAgent
-from .psychiatry_agent import PsychiatryAgent
-from .applications_agent import ApplicationsAgent
-from .product_manager_agent import ProductManagerAgent
-from .writing_agent import WritingAgent
-from .coordinator import CoordinatorAgent
-from .memory_enhanced_agent import MemoryEnhancedAgent
-from .citation_agent import CitationAgent, CitationGraph, Paper, Author
-from .unified_research_agent import (
-    UnifiedResearchAgent,
-    ResearchDomain,
-    create_psychology_research_agent,
-    create_statistics_research_agent,
-    create_interdisciplinary_agent,
-)
-from .alignment_agent import (
-    AlignmentAgent,
-    SimpleAlignmentPipeline,
-    AlignmentDataset,
-    PreferencePair,
-    quick_align_response,
-    generate_preference_dataset,
-    generate_sft_dataset,
-    dpo_loss_reference,
-)
-
-__all__ = [
-    "BaseAgent",
-    "StatisticsAgent",
-    "BiologyAgent",
-    "PsychologyAgent",
-    "PhilosophyAgent",
-    "PsychiatryAgent",
-    "ApplicationsAgent",
-    "ProductManagerAgent",
-    "WritingAgent",
-    "CoordinatorAgent",
-    "MemoryEnhancedAgent",
-    "CitationAgent",
-    "CitationGraph",
-    "Paper",
-    "Author",
-    "UnifiedResearchAgent",
-    "ResearchDomain",
-    "create_psychology_research_agent",
-    "create_statistics_research_agent",
-    "create_interdisciplinary_agent",
+"""Multi-domain research agents package.
+
+Exports are imported on first access (PEP 562), so importing a light
+submodule such as agents.search_cache or agents.llm_cache does not load
+every agent class and its dependencies.
+"""
+
+import importlib
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "BaseAgent": ".base_agent",
+    "StatisticsAgent": ".statistics_agent",
+    "BiologyAgent": ".biology_agent",
+    "PsychologyAgent": ".psychology_agent",
+    "PhilosophyAgent": ".philosophy_agent",
+    "PsychiatryAgent": ".psychiatry_agent",
+    "ApplicationsAgent": ".applications_agent",
+    "ProductManagerAgent": ".product_manager_agent",
+    "WritingAgent": ".writing_agent",
+    "CoordinatorAgent": ".coordinator",
+    "MemoryEnhancedAgent": ".memory_enhanced_agent",
+    "CitationAgent": ".citation_agent",
+    "CitationGraph": ".citation_agent",
+    "Paper": ".citation_agent",
+    "Author": ".citation_agent",
+    "UnifiedResearchAgent": ".unified_research_agent",
+    "ResearchDomain": ".unified_research_agent",
+    "create_psychology_research_agent": ".unified_research_agent",
+    "create_statistics_research_agent": ".unified_research_agent",
+    "create_interdisciplinary_agent": ".unified_research_agent",
     # Alignment
-    "AlignmentAgent",
-    "SimpleAlignmentPipeline",
-    "AlignmentDataset",
-    "PreferencePair",
-    "quick_align_response",
-    "generate_preference_dataset",
-    "generate_sft_dataset",
-    "dpo_loss_reference",
-]
+    "AlignmentAgent": ".alignment_agent",
+    "SimpleAlignmentPipeline": ".alignment_agent",
+    "AlignmentDataset": ".alignment_agent",
+    "PreferencePair": ".alignment_agent",
+    "quick_align_response": ".alignment_agent",
+    "generate_preference_dataset": ".alignment_agent",
+    "generate_preference_dataset_async": ".alignment_agent",
+    "generate_sft_dataset": ".alignment_agent",
+    "generate_sft_dataset_async": ".alignment_agent",
+    "dpo_loss_reference": ".alignment_agent",
+    "DPO_LOSS_REFERENCE": ".alignment_agent",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,12 +11,41 @@ References:
 - Constitutional AI: Bai et al. (2022) for principles-based feedback
 """
 
-import json
-import os
+import asyncio
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field, asdict
-from openai import OpenAI
+from openai import RateLimitError
+from memory.serialization import dumps as json_dumps, loads as json_loads
 from .base_agent import BaseAgent
+from .llm_cache import acached_chat, cached_chat
+from .openai_client import get_async_openai_client, get_openai_client
+
+
+def _retry_after_seconds(error: RateLimitError) -> float:
+    """Seconds the API asked us to wait (retry-after header), 0 if absent."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def _write_records(filepath: str, records: List[Dict]):
+    """Write records as JSON Lines for a .jsonl path, else as one indented JSON array."""
+    with open(filepath, 'wb') as f:
+        if filepath.endswith(".jsonl"):
+            for record in records:
+                f.write(json_dumps(record) + b"\n")
+        else:
+            f.write(json_dumps(records, indent=True))
+
+
+def _read_records(filepath: str) -> List[Dict]:
+    """Inverse of _write_records."""
+    with open(filepath, 'rb') as f:
+        if filepath.endswith(".jsonl"):
+            return [json_loads(line) for line in f if line.strip()]
+        return json_loads(f.read())
 
 
 @dataclass
@@ -61,13 +90,11 @@ class AlignmentDataset:
         ]
 
     def save(self, filepath: str):
-        with open(filepath, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        _write_records(filepath, self.to_dict())
 
     @classmethod
     def load(cls, filepath: str) -> 'AlignmentDataset':
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = _read_records(filepath)
         dataset = cls()
         for item in data:
             dataset.pairs.append(PreferencePair(**item))
@@ -78,7 +105,7 @@ class SimpleAlignmentPipeline:
     """Simple alignment pipeline with basic methods."""
 
     def __init__(self, model: str = "gpt-4"):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.model = model
         self.principles = [
             "Be helpful and informative",
@@ -94,15 +121,97 @@ class SimpleAlignmentPipeline:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        response = self.client.chat.completions.create(
+        response = cached_chat(
+            self.client,
             model=self.model,
             messages=messages,
             temperature=0.7
         )
         return response.choices[0].message.content
 
+    async def agenerate_response(self, prompt: str, system_prompt: str = None,
+                                 semaphore: Optional[asyncio.Semaphore] = None,
+                                 max_retries: int = 5) -> str:
+        """
+        Async generate_response, retried with exponential backoff on 429s.
+
+        The optional semaphore caps in-flight requests across a batch.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        semaphore = semaphore or asyncio.Semaphore(1)
+
+        for attempt in range(max_retries):
+            try:
+                async with semaphore:
+                    response = await acached_chat(
+                        get_async_openai_client(),
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.7
+                    )
+                return response.choices[0].message.content
+            except RateLimitError as e:
+                if attempt == max_retries - 1:
+                    raise
+                await asyncio.sleep(max(_retry_after_seconds(e), 2 ** attempt))
+
+    async def _ascore_response(self, prompt: str, response: str,
+                               semaphore: Optional[asyncio.Semaphore] = None) -> float:
+        """Async _score_response."""
+        try:
+            result = await self.agenerate_response(
+                self._scoring_prompt(prompt, response), semaphore=semaphore
+            )
+            score = float(result.strip())
+            return min(max(score, 1), 10)  # Clamp to 1-10
+        except Exception:
+            return 5.0  # Default score on error
+
+    async def best_of_n_async(self, prompt: str, n: int = 4,
+                              system_prompt: str = None,
+                              semaphore: Optional[asyncio.Semaphore] = None,
+                              early_stop_score: Optional[float] = None,
+                              ) -> Tuple[str, List[str]]:
+        """
+        Best-of-N sampling with the N candidates generated and judged concurrently.
+
+        Same result shape as best_of_n_sampling. If early_stop_score is set,
+        the first candidate judged at or above it cancels the rest, and only
+        the candidates finished by then are returned.
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(n, 1))
+
+        async def candidate(index: int) -> Tuple[int, str, float]:
+            response = await self.agenerate_response(prompt, system_prompt, semaphore)
+            return index, response, await self._ascore_response(prompt, response, semaphore)
+
+        pending = {asyncio.ensure_future(candidate(i)) for i in range(n)}
+        finished = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished.extend(task.result() for task in done)
+                if early_stop_score is not None and any(
+                    score >= early_stop_score for _, _, score in finished
+                ):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        finished.sort()
+        responses = [response for _, response, _ in finished]
+        scores = [score for _, _, score in finished]
+        best_idx = scores.index(max(scores))
+        return responses[best_idx], responses
+
     def best_of_n_sampling(self, prompt: str, n: int = 4,
-                           system_prompt: str = None) -> Tuple[str, List[str]]:
+                           system_prompt: str = None,
+                           early_stop_score: Optional[float] = None) -> Tuple[str, List[str]]:
         """
         Best-of-N sampling: Generate N responses and select the best.
         This is the simplest alignment method - no training required.
@@ -111,21 +220,21 @@ class SimpleAlignmentPipeline:
             prompt: The input prompt
             n: Number of responses to generate
             system_prompt: Optional system prompt
+            early_stop_score: Stop sampling once a response is judged at or
+                above this score (1-10); None always samples all N
 
         Returns:
             Tuple of (best_response, all_responses)
         """
-        # Generate N responses
         responses = []
+        scores = []
         for _ in range(n):
+            # Generate a response and score it using the model as a judge
             response = self.generate_response(prompt, system_prompt)
             responses.append(response)
-
-        # Score each response using the model as a judge
-        scores = []
-        for resp in responses:
-            score = self._score_response(prompt, resp)
-            scores.append(score)
+            scores.append(self._score_response(prompt, response))
+            if early_stop_score is not None and scores[-1] >= early_stop_score:
+                break
 
         # Return the best one
         best_idx = scores.index(max(scores))
@@ -133,7 +242,15 @@ class SimpleAlignmentPipeline:
 
     def _score_response(self, prompt: str, response: str) -> float:
         """Score a response using principles (1-10 scale)."""
-        scoring_prompt = f"""Rate the following response on a scale of 1-10.
+        try:
+            result = self.generate_response(self._scoring_prompt(prompt, response))
+            score = float(result.strip())
+            return min(max(score, 1), 10)  # Clamp to 1-10
+        except Exception:
+            return 5.0  # Default score on error
+
+    def _scoring_prompt(self, prompt: str, response: str) -> str:
+        return f"""Rate the following response on a scale of 1-10.
 
 Principles to evaluate:
 {chr(10).join(f'- {p}' for p in self.principles)}
@@ -144,12 +261,22 @@ Response to evaluate: {response}
 
 Provide ONLY a number from 1-10, nothing else."""
 
-        try:
-            result = self.generate_response(scoring_prompt)
-            score = float(result.strip())
-            return min(max(score, 1), 10)  # Clamp to 1-10
-        except:
-            return 5.0  # Default score on error
+    def _critique_prompt(self, prompt: str, initial_response: str) -> str:
+        return f"""Review this response and improve it according to these principles:
+{chr(10).join(f'- {p}' for p in self.principles)}
+
+Original prompt: {prompt}
+Original response: {initial_response}
+
+Provide an improved response that better follows the principles:"""
+
+    @staticmethod
+    def _helpful_prompt(prompt: str) -> str:
+        return f"""Respond helpfully, accurately, and safely to: {prompt}"""
+
+    @staticmethod
+    def _unhelpful_prompt(prompt: str) -> str:
+        return f"""Respond to the following in a brief, vague, and unhelpful way: {prompt}"""
 
     def generate_preference_pair(self, prompt: str) -> PreferencePair:
         """
@@ -162,15 +289,26 @@ Provide ONLY a number from 1-10, nothing else."""
         initial_response = self.generate_response(prompt)
 
         # Critique and improve using principles
-        critique_prompt = f"""Review this response and improve it according to these principles:
-{chr(10).join(f'- {p}' for p in self.principles)}
+        improved_response = self.generate_response(
+            self._critique_prompt(prompt, initial_response)
+        )
 
-Original prompt: {prompt}
-Original response: {initial_response}
+        return PreferencePair(
+            prompt=prompt,
+            chosen=improved_response,
+            rejected=initial_response,
+            metadata={"method": "constitutional_revision"}
+        )
 
-Provide an improved response that better follows the principles:"""
+    async def agenerate_preference_pair(self, prompt: str,
+                                        semaphore: Optional[asyncio.Semaphore] = None
+                                        ) -> PreferencePair:
+        """Async generate_preference_pair (the revision depends on the draft)."""
+        initial_response = await self.agenerate_response(prompt, semaphore=semaphore)
 
-        improved_response = self.generate_response(critique_prompt)
+        improved_response = await self.agenerate_response(
+            self._critique_prompt(prompt, initial_response), semaphore=semaphore
+        )
 
         return PreferencePair(
             prompt=prompt,
@@ -179,18 +317,32 @@ Provide an improved response that better follows the principles:"""
             metadata={"method": "constitutional_revision"}
         )
 
+    async def agenerate_contrastive_pair(self, prompt: str,
+                                         semaphore: Optional[asyncio.Semaphore] = None
+                                         ) -> PreferencePair:
+        """Async generate_contrastive_pair; both responses are requested at once."""
+        helpful_response, unhelpful_response = await asyncio.gather(
+            self.agenerate_response(self._helpful_prompt(prompt), semaphore=semaphore),
+            self.agenerate_response(self._unhelpful_prompt(prompt), semaphore=semaphore),
+        )
+
+        return PreferencePair(
+            prompt=prompt,
+            chosen=helpful_response,
+            rejected=unhelpful_response,
+            metadata={"method": "contrastive_generation"}
+        )
+
     def generate_contrastive_pair(self, prompt: str) -> PreferencePair:
         """
         Generate contrastive pair: one helpful, one unhelpful response.
         Simpler than constitutional approach - directly ask for both.
         """
         # Generate a helpful response
-        helpful_prompt = f"""Respond helpfully, accurately, and safely to: {prompt}"""
-        helpful_response = self.generate_response(helpful_prompt)
+        helpful_response = self.generate_response(self._helpful_prompt(prompt))
 
         # Generate a less helpful response (for contrast)
-        unhelpful_prompt = f"""Respond to the following in a brief, vague, and unhelpful way: {prompt}"""
-        unhelpful_response = self.generate_response(unhelpful_prompt)
+        unhelpful_response = self.generate_response(self._unhelpful_prompt(prompt))
 
         return PreferencePair(
             prompt=prompt,
@@ -220,6 +372,23 @@ Provide an improved response that better follows the principles:"""
             })
         return dataset
 
+    async def create_sft_dataset_async(self, prompts: List[str],
+                                       max_concurrency: int = 8) -> List[Dict]:
+        """
+        create_sft_dataset with every prompt's best-of-3 run in one event loop.
+
+        Requests across all prompts share one semaphore of max_concurrency.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(*[
+            self.best_of_n_async(prompt, n=3, semaphore=semaphore)
+            for prompt in prompts
+        ])
+        return [
+            {"instruction": prompt, "output": best_response}
+            for prompt, (best_response, _) in zip(prompts, results)
+        ]
+
     def create_dpo_dataset(self, prompts: List[str],
                            method: str = "constitutional") -> AlignmentDataset:
         """
@@ -243,6 +412,21 @@ Provide an improved response that better follows the principles:"""
 
         return dataset
 
+    async def create_dpo_dataset_async(self, prompts: List[str],
+                                       method: str = "constitutional",
+                                       max_concurrency: int = 8) -> AlignmentDataset:
+        """create_dpo_dataset with all prompts in flight at once (bounded)."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        make_pair = (
+            self.agenerate_preference_pair if method == "constitutional"
+            else self.agenerate_contrastive_pair
+        )
+        dataset = AlignmentDataset()
+        dataset.pairs.extend(await asyncio.gather(*[
+            make_pair(prompt, semaphore) for prompt in prompts
+        ]))
+        return dataset
+
 
 class AlignmentAgent(BaseAgent):
     """Agent specialized in LLM alignment methods and research."""
@@ -359,29 +543,36 @@ def generate_sft_dataset(prompts: List[str],
     """Generate and save an SFT dataset."""
     pipeline = SimpleAlignmentPipeline()
     dataset = pipeline.create_sft_dataset(prompts)
-    with open(output_file, 'w') as f:
-        json.dump(dataset, f, indent=2)
+    _write_records(output_file, dataset)
     print(f"Saved {len(dataset)} SFT examples to {output_file}")
     return dataset
 
 
-# DPO Loss Implementation (for reference/education)
-def dpo_loss_reference():
-    """
-    Reference implementation of DPO loss.
-    This is for educational purposes - actual training requires a full setup.
+async def generate_preference_dataset_async(prompts: List[str],
+                                            output_file: str = "preferences.json",
+                                            method: str = "constitutional",
+                                            concurrency: int = 8) -> AlignmentDataset:
+    """Async generate_preference_dataset with bounded request concurrency."""
+    pipeline = SimpleAlignmentPipeline()
+    dataset = await pipeline.create_dpo_dataset_async(prompts, method, concurrency)
+    dataset.save(output_file)
+    print(f"Saved {len(dataset.pairs)} preference pairs to {output_file}")
+    return dataset
 
-    The DPO loss is:
-    L_DPO = -log(sigmoid(beta * (log(pi(y_w|x)/pi_ref(y_w|x)) - log(pi(y_l|x)/pi_ref(y_l|x)))))
 
-    Where:
-    - pi is the policy (model being trained)
-    - pi_ref is the reference model (frozen)
-    - y_w is the preferred (winning) response
-    - y_l is the non-preferred (losing) response
-    - beta is a temperature parameter
-    """
-    code = '''
+async def generate_sft_dataset_async(prompts: List[str],
+                                     output_file: str = "sft_data.json",
+                                     concurrency: int = 8) -> List[Dict]:
+    """Async generate_sft_dataset with bounded request concurrency."""
+    pipeline = SimpleAlignmentPipeline()
+    dataset = await pipeline.create_sft_dataset_async(prompts, concurrency)
+    _write_records(output_file, dataset)
+    print(f"Saved {len(dataset)} SFT examples to {output_file}")
+    return dataset
+
+
+# DPO Loss Implementation (for reference/education)
+DPO_LOSS_REFERENCE = '''
 import torch
 import torch.nn.functional as F
 
@@ -415,4 +606,21 @@ def dpo_loss(
 
     return loss
 '''
-    return code
+
+
+def dpo_loss_reference():
+    """
+    Reference implementation of DPO loss.
+    This is for educational purposes - actual training requires a full setup.
+
+    The DPO loss is:
+    L_DPO = -log(sigmoid(beta * (log(pi(y_w|x)/pi_ref(y_w|x)) - log(pi(y_l|x)/pi_ref(y_l|x)))))
+
+    Where:
+    - pi is the policy (model being trained)
+    - pi_ref is the reference model (frozen)
+    - y_w is the preferred (winning) response
+    - y_l is the non-preferred (losing) response
+    - beta is a temperature parameter
+    """
+    return DPO_LOSS_REFERENCE
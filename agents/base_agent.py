@@ -1,17 +1,19 @@
 """Base agent class with shared functionality."""
 
 import json
-import os
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from openai import OpenAI
-from duckduckgo_search import DDGS
+from .batch_api import batch_chat
+from .llm_cache import cached_chat, cached_chat_stream
+from .openai_client import get_openai_client
+from .search_cache import ddgs_text
 
 
 class BaseAgent(ABC):
     """Base class for all research agents."""
 
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.conversation_history = []
         self.tools = self._get_tools()
 
@@ -58,8 +60,7 @@ class BaseAgent(ABC):
     def web_search(self, query: str) -> str:
         """Perform a web search using DuckDuckGo."""
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=8))
+            results = ddgs_text(query, max_results=8)
 
             if not results:
                 return "No results found."
@@ -76,50 +77,55 @@ class BaseAgent(ABC):
             return f"Search error: {e}"
 
     def _process_tool_calls(self, tool_calls) -> list:
-        """Process tool calls and return results."""
-        results = []
-        for tool_call in tool_calls:
-            if tool_call.function.name == "web_search":
-                args = json.loads(tool_call.function.arguments)
-                print(f"  [{self.name}] Searching: {args['query'][:50]}...")
-                result = self.web_search(args["query"])
-                results.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "content": result
-                })
-        return results
+        """Process tool calls and return results, running parallel searches concurrently."""
+        searches = [tc for tc in tool_calls if tc.function.name == "web_search"]
+        queries = [json.loads(tc.function.arguments)["query"] for tc in searches]
+        for query in queries:
+            print(f"  [{self.name}] Searching: {query[:50]}...")
+        if len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+                outputs = list(pool.map(self.web_search, queries))
+        else:
+            outputs = [self.web_search(q) for q in queries]
+
+        return [
+            {
+                "tool_call_id": tool_call.id,
+                "role": "tool",
+                "content": result
+            }
+            for tool_call, result in zip(searches, outputs)
+        ]
 
-    def chat(self, user_message: str) -> str:
-        """Send a message and get a response."""
+    def chat(self, user_message: str, on_text=None, on_discard=None) -> str:
+        """
+        Send a message and get a response.
+
+        If on_text is given, responses are streamed and on_text is called
+        with each text delta as it arrives. Text streamed in a turn that ends
+        in tool calls is not part of the answer; on_discard, if given, is
+        called after such a turn so the caller can drop it.
+        """
         self.conversation_history.append({"role": "user", "content": user_message})
 
         while True:
-            response = self.client.chat.completions.create(
+            request = dict(
                 model="gpt-4",
                 messages=[{"role": "system", "content": self.system_prompt}] + self.conversation_history,
                 tools=self.tools,
                 tool_choice="auto"
             )
+            if on_text is None:
+                response = cached_chat(self.client, **request)
+            else:
+                response = cached_chat_stream(self.client, on_text, **request)
 
             message = response.choices[0].message
 
             if message.tool_calls:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
+                self.conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
+                if on_discard is not None and message.content:
+                    on_discard()
 
                 tool_results = self._process_tool_calls(message.tool_calls)
                 self.conversation_history.extend(tool_results)
@@ -130,6 +136,23 @@ class BaseAgent(ABC):
                 })
                 return message.content
 
+    def chat_batch(self, user_message: str) -> str:
+        """
+        chat() through the Batch API: half the cost, up to 24h latency.
+
+        Batch jobs can't run the tool loop, so the model answers without
+        web search.
+        """
+        self.conversation_history.append({"role": "user", "content": user_message})
+        response = batch_chat(
+            self.client,
+            model="gpt-4",
+            messages=[{"role": "system", "content": self.system_prompt}] + self.conversation_history,
+        )
+        content = response.choices[0].message.content
+        self.conversation_history.append({"role": "assistant", "content": content})
+        return content
+
     def clear_history(self):
         """Clear conversation history."""
         self.conversation_history = []
@@ -0,0 +1,53 @@
+"""Chat completions through the OpenAI Batch API.
+
+Batch requests cost half as much as synchronous ones in exchange for up to
+24h latency, which suits scripted pipeline runs (e.g. regression runs) that
+nobody is watching. A batch job cannot run the agents' tool-call loop, so
+requests go out without tools.
+"""
+
+import json
+import time
+
+from openai.types.chat import ChatCompletion
+
+from .llm_cache import get_response_cache
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def submit_chat_batch(client, body: dict, poll_seconds: float = 30.0) -> ChatCompletion:
+    """Run one /v1/chat/completions request as a batch job and wait for it."""
+    line = {"custom_id": "request-0", "method": "POST", "url": "/v1/chat/completions", "body": body}
+    input_file = client.files.create(
+        file=("batch.jsonl", json.dumps(line).encode("utf-8")), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    while batch.status not in _TERMINAL_STATUSES:
+        time.sleep(poll_seconds)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        detail = ""
+        if batch.error_file_id:
+            detail = ": " + client.files.content(batch.error_file_id).text.strip()
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}{detail}")
+
+    record = json.loads(client.files.content(batch.output_file_id).text.splitlines()[0])
+    return ChatCompletion.model_validate(record["response"]["body"])
+
+
+def batch_chat(client, poll_seconds: float = 30.0, **kwargs) -> ChatCompletion:
+    """submit_chat_batch(kwargs), served from the response cache when enabled."""
+    cache = get_response_cache()
+    key = cache.key_for(kwargs) if cache is not None else None
+    response = cache.get(key) if cache is not None else None
+    if response is None:
+        response = submit_chat_batch(client, kwargs, poll_seconds)
+        if cache is not None:
+            cache.set(key, response)
+    return response
@@ -9,15 +9,32 @@ This agent serves as a subagent for domain-specific agents, providing:
 - Cross-domain citation patterns
 """
 
+import copy
+import heapq
 import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple, Any
-from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Any
+from collections import Counter, defaultdict
+from itertools import islice
 
-from openai import OpenAI
-from duckduckgo_search import DDGS
+from memory.serialization import dumps as json_dumps, loads as json_loads
+
+from .openai_client import get_openai_client
+from .search_cache import ddgs_text
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    """All length-3 substrings of text (empty when text is shorter)."""
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _h_index(citation_counts: List[int]) -> int:
+    """Largest h such that h papers have at least h citations each."""
+    ranked = sorted(citation_counts, reverse=True)
+    # ranked[i] >= i + 1 holds for a prefix only, so counting it gives h
+    return sum(1 for rank, count in enumerate(ranked, 1) if count >= rank)
 
 
 @dataclass
@@ -125,13 +142,33 @@ class CitationGraph:
         self.papers: Dict[str, Paper] = {}
         self.authors: Dict[str, Author] = {}
         self._persist_path = persist_path
+        # Bumped by every mutator; get_statistics() reuses its snapshot until it changes
+        self._version = 0
+        self._stats_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # Trigram -> paper ids over lowercased title + abstract, to prefilter
+        # substring searches; _paper_grams lets a re-added paper be unindexed
+        self._gram_index: Dict[str, Set[str]] = defaultdict(set)
+        self._paper_grams: Dict[str, FrozenSet[str]] = {}
 
         if persist_path and os.path.exists(persist_path):
             self._load()
 
     def add_paper(self, paper: Paper) -> str:
         """Add a paper to the graph."""
+        self._insert_paper(paper)
+        self._persist()
+        return paper.paper_id
+
+    def add_papers(self, papers: List[Paper]) -> List[str]:
+        """Add several papers, writing the graph to disk once at the end."""
+        for paper in papers:
+            self._insert_paper(paper)
+        self._persist()
+        return [paper.paper_id for paper in papers]
+
+    def _insert_paper(self, paper: Paper) -> None:
         self.papers[paper.paper_id] = paper
+        self._index_text(paper)
 
         # Update author records
         for author_name in paper.authors:
@@ -148,8 +185,7 @@ class CitationGraph:
                 if coauthor != author_name:
                     author.collaborators.add(coauthor)
 
-        self._persist()
-        return paper.paper_id
+        self._version += 1
 
     def add_citation(self, citing_paper_id: str, cited_paper_id: str) -> bool:
         """Add a citation link between two papers."""
@@ -166,10 +202,11 @@ class CitationGraph:
             cited.citation_count = len(cited.cited_by)
 
         # Update author citation counts
-        for author_name in cited.authors:
+        for author_name in dict.fromkeys(cited.authors):
             if author_name in self.authors:
                 self._recalculate_author_stats(author_name)
 
+        self._version += 1
         self._persist()
         return True
 
@@ -179,23 +216,31 @@ class CitationGraph:
             return
 
         author = self.authors[author_name]
-        citation_counts = []
-
-        for paper_id in author.papers:
-            if paper_id in self.papers:
-                citation_counts.append(self.papers[paper_id].citation_count)
+        papers = self.papers
+        citation_counts = [
+            papers[paper_id].citation_count for paper_id in author.papers if paper_id in papers
+        ]
 
         author.total_citations = sum(citation_counts)
-
-        # Calculate h-index
-        citation_counts.sort(reverse=True)
-        h = 0
-        for i, count in enumerate(citation_counts):
-            if count >= i + 1:
-                h = i + 1
-            else:
-                break
-        author.h_index = h
+        author.h_index = _h_index(citation_counts)
+
+    def _index_text(self, paper: Paper) -> None:
+        """(Re)index the trigrams of a paper's title and abstract."""
+        old = self._paper_grams.get(paper.paper_id, frozenset())
+        grams = _trigrams(f"{paper.title.lower()}\n{paper.abstract.lower()}")
+        for gram in old - grams:
+            self._gram_index[gram].discard(paper.paper_id)
+        for gram in grams - old:
+            self._gram_index[gram].add(paper.paper_id)
+        self._paper_grams[paper.paper_id] = grams
+
+    def _text_candidates(self, query_lower: str) -> Optional[Set[str]]:
+        """Ids that may contain query_lower, or None if the index can't narrow it."""
+        grams = _trigrams(query_lower)
+        if not grams:
+            return None
+        postings = sorted((self._gram_index.get(g, set()) for g in grams), key=len)
+        return postings[0].intersection(*postings[1:])
 
     def get_paper(self, paper_id: str) -> Optional[Paper]:
         """Get a paper by ID."""
@@ -217,7 +262,13 @@ class CitationGraph:
         results = []
         query_lower = query.lower()
 
-        for paper in self.papers.values():
+        papers = self.papers.values()
+        if query:
+            candidates = self._text_candidates(query_lower)
+            if candidates is not None:
+                papers = [p for p in papers if p.paper_id in candidates]
+
+        for paper in papers:
             # Filter by query
             if query and query_lower not in paper.title.lower():
                 if query_lower not in paper.abstract.lower():
@@ -284,9 +335,10 @@ class CitationGraph:
             "shared_papers": {},
         }
 
-        for collab_name in list(author.collaborators)[:20]:
-            if collab_name in self.authors:
-                collab = self.authors[collab_name]
+        author_papers = set(author.papers)
+        for collab_name in islice(author.collaborators, 20):
+            collab = self.authors.get(collab_name)
+            if collab is not None:
                 network["collaborators"].append({
                     "name": collab.name,
                     "h_index": collab.h_index,
@@ -294,25 +346,31 @@ class CitationGraph:
                 })
 
                 # Find shared papers
-                shared = set(author.papers) & set(collab.papers)
+                shared = author_papers.intersection(collab.papers)
                 if shared:
                     network["shared_papers"][collab_name] = len(shared)
 
         return network
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get overall citation statistics."""
+        """Get overall citation statistics (cached until the graph changes)."""
+        if self._stats_cache is None or self._stats_cache[0] != self._version:
+            self._stats_cache = (self._version, self._compute_statistics())
+        return copy.deepcopy(self._stats_cache[1])
+
+    def _compute_statistics(self) -> Dict[str, Any]:
         if not self.papers:
             return {"total_papers": 0, "total_authors": 0}
 
         citation_counts = [p.citation_count for p in self.papers.values()]
+        total_citations = sum(citation_counts)
 
         return {
             "total_papers": len(self.papers),
             "total_authors": len(self.authors),
-            "total_citations": sum(citation_counts),
-            "avg_citations": sum(citation_counts) / len(citation_counts) if citation_counts else 0,
-            "max_citations": max(citation_counts) if citation_counts else 0,
+            "total_citations": total_citations,
+            "avg_citations": total_citations / len(citation_counts),
+            "max_citations": max(citation_counts),
             "papers_by_domain": self._count_by_domain(),
             "top_cited_papers": self._get_top_cited(5),
             "top_authors": self._get_top_authors(5),
@@ -320,34 +378,27 @@ class CitationGraph:
 
     def _count_by_domain(self) -> Dict[str, int]:
         """Count papers by domain."""
-        counts = defaultdict(int)
+        counts = Counter()
         for paper in self.papers.values():
-            for domain in paper.domains:
-                counts[domain] += 1
+            counts.update(paper.domains)
         return dict(counts)
 
     def _get_top_cited(self, n: int) -> List[Dict]:
         """Get top N cited papers."""
-        sorted_papers = sorted(
-            self.papers.values(),
-            key=lambda p: p.citation_count,
-            reverse=True
-        )
+        top_papers = heapq.nlargest(n, self.papers.values(), key=lambda p: p.citation_count)
         return [
             {"title": p.title, "citations": p.citation_count, "authors": p.authors[:3]}
-            for p in sorted_papers[:n]
+            for p in top_papers
         ]
 
     def _get_top_authors(self, n: int) -> List[Dict]:
         """Get top N authors by h-index."""
-        sorted_authors = sorted(
-            self.authors.values(),
-            key=lambda a: (a.h_index, a.total_citations),
-            reverse=True
+        top_authors = heapq.nlargest(
+            n, self.authors.values(), key=lambda a: (a.h_index, a.total_citations)
         )
         return [
             {"name": a.name, "h_index": a.h_index, "citations": a.total_citations}
-            for a in sorted_authors[:n]
+            for a in top_authors
         ]
 
     def _persist(self) -> None:
@@ -357,17 +408,24 @@ class CitationGraph:
                 "papers": {k: v.to_dict() for k, v in self.papers.items()},
                 "authors": {k: v.to_dict() for k, v in self.authors.items()},
             }
-            os.makedirs(os.path.dirname(self._persist_path), exist_ok=True)
-            with open(self._persist_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            directory = os.path.dirname(self._persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self._persist_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json_dumps(data, indent=True))
+            os.replace(tmp_path, self._persist_path)
 
     def _load(self) -> None:
         """Load from disk."""
         try:
-            with open(self._persist_path, 'r') as f:
-                data = json.load(f)
+            with open(self._persist_path, 'rb') as f:
+                data = json_loads(f.read())
             self.papers = {k: Paper.from_dict(v) for k, v in data.get("papers", {}).items()}
             self.authors = {k: Author.from_dict(v) for k, v in data.get("authors", {}).items()}
+            for paper in self.papers.values():
+                self._index_text(paper)
+            self._version += 1
         except (json.JSONDecodeError, FileNotFoundError):
             pass
 
@@ -385,7 +443,7 @@ class CitationAgent:
     """
 
     def __init__(self, persist_dir: Optional[str] = None):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.conversation_history = []
 
         # Initialize citation graph
@@ -516,8 +574,7 @@ Always provide citation counts and author metrics when discussing papers."""
         search_query += " citations"
 
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(search_query, max_results=10))
+            results = ddgs_text(search_query, max_results=10)
 
             if not results:
                 return "No papers found."
@@ -544,10 +601,28 @@ Always provide citation counts and author metrics when discussing papers."""
         abstract: str = "",
     ) -> str:
         """Record a paper in the citation graph."""
+        paper = self._make_paper(title, authors, year, citations, venue, domain, abstract)
+        self.graph.add_paper(paper)
+        return f"Recorded paper '{title}' (ID: {paper.paper_id}) with {citations} citations"
+
+    def record_papers_bulk(self, papers: List[Dict[str, Any]]) -> List[str]:
+        """Record several papers (record_paper kwargs dicts) with a single save."""
+        return self.graph.add_papers([self._make_paper(**p) for p in papers])
+
+    @staticmethod
+    def _make_paper(
+        title: str,
+        authors: List[str],
+        year: int,
+        citations: int,
+        venue: str = "",
+        domain: str = "",
+        abstract: str = "",
+    ) -> Paper:
         import hashlib
         paper_id = hashlib.sha256(f"{title}{year}".encode()).hexdigest()[:12]
 
-        paper = Paper(
+        return Paper(
             title=title,
             paper_id=paper_id,
             authors=authors,
@@ -558,9 +633,6 @@ Always provide citation counts and author metrics when discussing papers."""
             domains={domain} if domain else set(),
         )
 
-        self.graph.add_paper(paper)
-        return f"Recorded paper '{title}' (ID: {paper_id}) with {citations} citations"
-
     def get_author_info(self, author_name: str) -> str:
         """Get author information."""
         author = self.graph.get_author(author_name)
@@ -632,21 +704,7 @@ Always provide citation counts and author metrics when discussing papers."""
             message = response.choices[0].message
 
             if message.tool_calls:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
+                self.conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
 
                 tool_results = self._process_tool_calls(message.tool_calls)
                 self.conversation_history.extend(tool_results)
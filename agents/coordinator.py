@@ -1,8 +1,7 @@
 """Coordinator Agent - Orchestrates multiple specialized agents."""
 
 import json
-import os
-from openai import OpenAI
+from .openai_client import get_openai_client
 
 from .statistics_agent import StatisticsAgent
 from .biology_agent import BiologyAgent
@@ -24,7 +23,7 @@ class CoordinatorAgent:
     """
 
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.conversation_history = []
 
         # Initialize all specialist agents
@@ -144,21 +143,7 @@ When delegating, use the delegate_to_agent tool with the agent key and a clear,
             message = response.choices[0].message
 
             if message.tool_calls:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
+                self.conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
 
                 tool_results = self._process_tool_calls(message.tool_calls)
                 self.conversation_history.extend(tool_results)
@@ -0,0 +1,220 @@
+"""On-disk cache for chat completions, so re-running a demo does not re-spend tokens.
+
+Entries are content-addressed: the key is a sha256 of the full request
+(model, messages, tools, sampling params). Repeating an identical request
+within one run (e.g. the N samples of best-of-N) maps to successive
+entries, so cached runs keep the same diversity as the original one.
+
+Entries expire after max_age_seconds (7 days by default) and the oldest are
+pruned beyond max_entries. The cache is off until enable_response_cache() is
+called; the batch pipeline scripts turn it on by default and expose
+--no-cache, the interactive agent only with --cache. To empty it, call
+get_response_cache().clear() or delete the .llm_cache/ directory.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from openai.types.chat import ChatCompletion
+
+DEFAULT_CACHE_PATH = os.path.join(".llm_cache", "responses.sqlite")
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class ResponseCache:
+    """Thread-safe sqlite store of serialized ChatCompletion objects."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, created_at REAL NOT NULL DEFAULT 0)"
+        )
+        # Files written before entries were timestamped: add the column; their
+        # rows read as created at 0, so they count as expired
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        if "created_at" not in columns:
+            self._conn.execute(
+                "ALTER TABLE responses ADD COLUMN created_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)"
+        )
+        self._prune()
+        self._conn.commit()
+        self._seen = Counter()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, request: dict) -> str:
+        """Key for the next occurrence of this request in the current run."""
+        digest = hashlib.sha256(
+            json.dumps(request, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            occurrence = self._seen[digest]
+            self._seen[digest] += 1
+        return f"{digest}:{occurrence}"
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.max_age_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ChatCompletion.model_validate_json(row[0])
+
+    def set(self, key: str, response: ChatCompletion):
+        body = response.model_dump_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, created_at) VALUES (?, ?, ?)",
+                (key, body, time.time()),
+            )
+            self._prune()
+            self._conn.commit()
+
+    def _prune(self):
+        """Delete expired entries, then the oldest beyond max_entries (caller commits)."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+        )
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._seen.clear()
+
+
+_active_cache: Optional[ResponseCache] = None
+
+
+def enable_response_cache(
+    path: str = DEFAULT_CACHE_PATH,
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> ResponseCache:
+    """Route cached_chat/acached_chat through an on-disk cache at path."""
+    global _active_cache
+    _active_cache = ResponseCache(path, max_age_seconds, max_entries)
+    return _active_cache
+
+
+def disable_response_cache():
+    """Send every request straight to the API."""
+    global _active_cache
+    _active_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _active_cache
+
+
+def cached_chat(client, **kwargs) -> ChatCompletion:
+    """client.chat.completions.create(**kwargs), served from the cache when enabled."""
+    cache = _active_cache
+    if cache is None:
+        return client.chat.completions.create(**kwargs)
+    key = cache.key_for(kwargs)
+    response = cache.get(key)
+    if response is None:
+        response = client.chat.completions.create(**kwargs)
+        cache.set(key, response)
+    return response
+
+
+async def acached_chat(async_client, **kwargs) -> ChatCompletion:
+    """Async cached_chat for an AsyncOpenAI client."""
+    cache = _active_cache
+    if cache is None:
+        return await async_client.chat.completions.create(**kwargs)
+    key = cache.key_for(kwargs)
+    response = cache.get(key)
+    if response is None:
+        response = await async_client.chat.completions.create(**kwargs)
+        cache.set(key, response)
+    return response
+
+
+def _assemble_stream(stream, on_text: Callable[[str], None]) -> ChatCompletion:
+    """Consume a stream=True response, forwarding text deltas; return the whole completion."""
+    meta = {"id": "", "created": 0, "model": ""}
+    content, tool_calls, finish_reason = [], {}, None
+    for chunk in stream:
+        meta.update(id=chunk.id, created=chunk.created, model=chunk.model)
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        finish_reason = choice.finish_reason or finish_reason
+        delta = choice.delta
+        if delta.content:
+            content.append(delta.content)
+            on_text(delta.content)
+        for tc in delta.tool_calls or []:
+            call = tool_calls.setdefault(
+                tc.index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+            )
+            if tc.id:
+                call["id"] = tc.id
+            if tc.function and tc.function.name:
+                call["function"]["name"] += tc.function.name
+            if tc.function and tc.function.arguments:
+                call["function"]["arguments"] += tc.function.arguments
+
+    message = {"role": "assistant", "content": "".join(content) or None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[i] for i in sorted(tool_calls)]
+    return ChatCompletion.model_validate({
+        "object": "chat.completion",
+        **meta,
+        "choices": [{"index": 0, "finish_reason": finish_reason or "stop", "message": message}],
+    })
+
+
+def cached_chat_stream(client, on_text: Callable[[str], None], **kwargs) -> ChatCompletion:
+    """
+    cached_chat with the answer streamed: on_text receives text as it arrives.
+
+    A cache hit delivers the stored text in one call. The cache key is the
+    same as for cached_chat, so streamed and plain runs share entries.
+    """
+    cache = _active_cache
+    key = cache.key_for(kwargs) if cache is not None else None
+    response = cache.get(key) if cache is not None else None
+    if response is not None:
+        if response.choices[0].message.content:
+            on_text(response.choices[0].message.content)
+        return response
+    response = _assemble_stream(client.chat.completions.create(stream=True, **kwargs), on_text)
+    if cache is not None:
+        cache.set(key, response)
+    return response
@@ -10,8 +10,8 @@ import json
 import os
 from typing import Optional
 
-from openai import OpenAI
-from duckduckgo_search import DDGS
+from .openai_client import get_openai_client
+from .search_cache import ddgs_text
 
 from memory import (
     MemoryAgentMixin,
@@ -46,7 +46,7 @@ class MemoryEnhancedAgent(MemoryAgentMixin):
             enable_memory: Whether to enable memory features (default True)
             memory_persist_dir: Directory for memory persistence (optional)
         """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.conversation_history = []
         self.tools = self._get_tools()
 
@@ -104,8 +104,7 @@ You track your own assumptions and flag when information may need verification."
     def web_search(self, query: str) -> str:
         """Perform a web search using DuckDuckGo."""
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=8))
+            results = ddgs_text(query, max_results=8)
 
             if not results:
                 return "No results found."
@@ -167,21 +166,7 @@ You track your own assumptions and flag when information may need verification."
             message = response.choices[0].message
 
             if message.tool_calls:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
+                self.conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
 
                 tool_results = self._process_tool_calls(message.tool_calls)
                 self.conversation_history.extend(tool_results)
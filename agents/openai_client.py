@@ -0,0 +1,89 @@
+"""Process-wide OpenAI client shared by every agent.
+
+One client means one HTTP connection pool, so agents created side by side
+reuse keep-alive connections instead of each opening their own. When the
+optional h2 package is installed the pool speaks HTTP/2, so concurrent
+requests (parallel tool calls, pipeline stages) share one TLS connection.
+The async client is shared the same way within an event loop.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from typing import Optional
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+try:
+    import h2
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+# httpx only negotiates HTTP/2 when h2 is importable
+HTTP2_AVAILABLE = h2 is not None
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def make_http_client() -> DefaultHttpxClient:
+    """httpx client with the SDK's defaults, on HTTP/2 when available."""
+    return DefaultHttpxClient(http2=HTTP2_AVAILABLE)
+
+
+def make_async_http_client() -> DefaultAsyncHttpxClient:
+    """Async counterpart of make_http_client, for AsyncOpenAI."""
+    return DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE)
+
+
+def get_openai_client() -> OpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=make_http_client(),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client for the running event loop.
+
+    An async connection pool is bound to the loop that opened it, so a new
+    loop (e.g. a second asyncio.run) gets a fresh client.
+    """
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_loop is not loop:
+        _async_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=make_async_http_client(),
+        )
+        _async_loop = loop
+    return _async_client
+
+
+async def close_async_openai_client():
+    """Close the shared async client; await before its event loop ends."""
+    global _async_client, _async_loop
+    client, _async_client, _async_loop = _async_client, None, None
+    if client is not None:
+        await client.close()
+
+
+def run_with_async_client(coro):
+    """asyncio.run(coro), closing the shared async client before the loop ends."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_openai_client()
+
+    return asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Process-wide cache of web search results (DuckDuckGo, Tavily).
+
+Agents often repeat a search within a session (tool-call retries, several
+agents researching one topic). Results are kept for ttl_seconds and the
+least recently used queries are evicted beyond maxsize. Failed searches
+raise as before and are not cached.
+"""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+
+class SearchCache:
+    """Thread-safe TTL + LRU map from (source, normalized query, max_results) to results."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[Tuple[str, str, int], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(source: str, query: str, max_results: int) -> Tuple[str, str, int]:
+        return source, " ".join(query.lower().split()), max_results
+
+    def text(self, query: str, max_results: int = 8) -> List[Dict]:
+        """list(DDGS().text(query, max_results)), served from the cache when fresh."""
+        return self.fetch("ddg", query, max_results, lambda: _ddgs_search(query, max_results))
+
+    def fetch(
+        self,
+        source: str,
+        query: str,
+        max_results: int,
+        search: Callable[[], List[Dict]],
+    ) -> List[Dict]:
+        """search() for this source/query, served from the cache when fresh."""
+        key = self._key(source, query, max_results)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._cache.move_to_end(key)
+                return list(entry[1])
+
+        results = list(search())
+
+        with self._lock:
+            self._cache[key] = (now, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return list(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Idle DDGS sessions. Each search checks one out (creating it if none is
+# idle) and returns it afterwards, so keep-alive connections are reused across
+# searches while concurrent searches never share a session.
+_idle_sessions: list = []
+_sessions_lock = threading.Lock()
+
+
+def _close_sessions() -> None:
+    with _sessions_lock:
+        sessions, _idle_sessions[:] = list(_idle_sessions), []
+    for ddgs in sessions:
+        ddgs.__exit__(None, None, None)
+
+
+def _ddgs_search(query: str, max_results: int) -> List[Dict]:
+    # Imported on first search: duckduckgo_search pulls in its HTTP/TLS stack,
+    # which importing the agents package should not pay for
+    from duckduckgo_search import DDGS
+
+    with _sessions_lock:
+        ddgs = _idle_sessions.pop() if _idle_sessions else None
+    if ddgs is None:
+        ddgs = DDGS().__enter__()
+    try:
+        results = list(ddgs.text(query, max_results=max_results))
+    except Exception:
+        # A failed request may leave the session in a bad state; drop it
+        ddgs.__exit__(None, None, None)
+        raise
+    with _sessions_lock:
+        _idle_sessions.append(ddgs)
+    return results
+
+
+atexit.register(_close_sessions)
+
+
+search_cache = SearchCache()
+
+
+def ddgs_text(query: str, max_results: int = 8) -> List[Dict]:
+    """Cached DuckDuckGo text search shared by all agents."""
+    return search_cache.text(query, max_results)
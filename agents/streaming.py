@@ -0,0 +1,107 @@
+"""Run agent chats in the background while their answers stream in.
+
+Used by the multi-agent pipeline scripts: a downstream agent that only
+quotes the first N characters of an upstream answer can start as soon as
+those characters exist, instead of waiting for the whole response.
+"""
+
+import sys
+import threading
+
+_FLUSH_AFTER = ('\n', '.', '!', '?', ':')
+
+
+def flushing_writer(stream=None):
+    """on_text callback that writes deltas and flushes at line and sentence ends.
+
+    Grouping flushes this way shows a streamed answer promptly on a terminal
+    or pipe without a flush per token.
+    """
+    stream = stream or sys.stdout
+
+    def write(piece):
+        stream.write(piece)
+        if piece.rstrip(' ').endswith(_FLUSH_AFTER) or '\n' in piece:
+            stream.flush()
+
+    return write
+
+
+class StreamedResponse:
+    """Run agent.chat(query) in a background thread, streaming its answer.
+
+    prefix(n) returns as soon as n characters have arrived, so the next agent
+    can start while this one is still generating. Text from tool-calling
+    turns is dropped when the turn ends, so the buffer tracks the final answer.
+    """
+
+    def __init__(self, agent, query):
+        self._text = ''
+        self._response = None
+        self._done = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, args=(agent, query), daemon=True)
+        self._thread.start()
+
+    def _run(self, agent, query):
+        try:
+            self._response = self._call(agent, query)
+        except Exception as e:
+            self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def _call(self, agent, query):
+        return agent.chat(query, on_text=self._append, on_discard=self._reset)
+
+    def _append(self, piece):
+        with self._cond:
+            self._text += piece
+            self._cond.notify_all()
+
+    def _reset(self):
+        with self._cond:
+            self._text = ''
+
+    def prefix(self, n):
+        with self._cond:
+            self._cond.wait_for(lambda: self._done or len(self._text) >= n)
+            if self._error is not None:
+                raise self._error
+            return self._text[:n]
+
+    def excerpt(self, n):
+        """prefix(n), cut back to the last line or sentence break when the answer is longer.
+
+        Falls back to the hard cut if no break lies in the second half of the
+        prefix, so a quote never shrinks below n // 2 characters.
+        """
+        text = self.prefix(n + 1)
+        if len(text) <= n:
+            return text
+        text = text[:n]
+        cut = max(text.rfind("\n"), text.rfind(". "))
+        if cut >= n // 2:
+            return text[:cut + 1].rstrip()
+        return text
+
+    def result(self):
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+
+class BatchedResponse(StreamedResponse):
+    """StreamedResponse that runs agent.chat_batch(query) via the Batch API.
+
+    Nothing streams: prefix() and excerpt() wait for the whole answer.
+    """
+
+    def _call(self, agent, query):
+        response = agent.chat_batch(query)
+        self._append(response or '')
+        return response
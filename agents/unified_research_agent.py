@@ -15,10 +15,10 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from openai import OpenAI
-from duckduckgo_search import DDGS
-
 from .citation_agent import CitationAgent, Paper, Author
+from .llm_cache import cached_chat, cached_chat_stream
+from .openai_client import get_openai_client
+from .search_cache import ddgs_text
 from memory import (
     MemoryAgentMixin,
     MemoryCategory,
@@ -126,7 +126,7 @@ class UnifiedResearchAgent(MemoryAgentMixin):
             persist_dir: Directory for persisting memory and citations
             enable_memory: Whether to enable memory features
         """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.conversation_history = []
 
         self.primary_domain = primary_domain
@@ -318,8 +318,7 @@ Total citations: {stats.get('total_citations', 0)}
             search_query += f" {domain}"
 
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(search_query, max_results=10))
+            results = ddgs_text(search_query, max_results=10)
 
             if not results:
                 return "No results found."
@@ -422,39 +421,29 @@ Total citations: {stats.get('total_citations', 0)}
 
         return results
 
-    def chat(self, user_message: str) -> str:
-        """Process a chat message."""
+    def chat(self, user_message: str, on_text=None) -> str:
+        """Process a chat message, streaming text deltas to on_text if given."""
         # Pre-chat hook for memory
         self.on_chat_start(user_message)
 
         self.conversation_history.append({"role": "user", "content": user_message})
 
         while True:
-            response = self.client.chat.completions.create(
+            request = dict(
                 model="gpt-4",
                 messages=[{"role": "system", "content": self.system_prompt}] + self.conversation_history,
                 tools=self.tools,
                 tool_choice="auto"
             )
+            if on_text is None:
+                response = cached_chat(self.client, **request)
+            else:
+                response = cached_chat_stream(self.client, on_text, **request)
 
             message = response.choices[0].message
 
             if message.tool_calls:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
+                self.conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
 
                 tool_results = self._process_tool_calls(message.tool_calls)
                 self.conversation_history.extend(tool_results)
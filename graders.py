@@ -1,6 +1,14 @@
 """LLM-based graders for routing, hallucination checking, and answer quality."""
 
+import copy
+import hashlib
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -16,6 +24,57 @@ llm = ChatOpenAI(
 )
 
 
+# ============================================================================
+# Grader Result Cache
+# ============================================================================
+class CachedGrader:
+    """
+    Memoizes a grader chain's invoke() on its exact inputs.
+
+    Graders run at temperature 0, so identical inputs (e.g. re-grading an
+    unchanged synthesis on a retry) reuse the earlier verdict instead of
+    paying for another LLM call. Entries expire after ttl_seconds and the
+    least recently used are evicted beyond maxsize.
+    """
+
+    def __init__(self, chain, maxsize: int = 512, ttl_seconds: float = 1800):
+        self.chain = chain
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(inputs: Dict[str, Any]) -> str:
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def invoke(self, inputs: Dict[str, Any], *args, **kwargs) -> Any:
+        key = self._key(inputs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._cache.move_to_end(key)
+                return copy.deepcopy(entry[1])
+
+        result = self.chain.invoke(inputs, *args, **kwargs)
+
+        with self._lock:
+            self._cache[key] = (now, copy.deepcopy(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.chain, name)
+
+
 # ============================================================================
 # Question Router
 # ============================================================================
@@ -56,7 +115,7 @@ Output a JSON object with this exact structure:
     input_variables=["question"]
 )
 
-question_router = router_prompt | llm | JsonOutputParser()
+question_router = CachedGrader(router_prompt | llm | JsonOutputParser())
 
 
 # ============================================================================
@@ -90,7 +149,7 @@ Output a JSON object with this exact structure:
     input_variables=["documents", "generation"]
 )
 
-hallucination_grader = hallucination_prompt | llm | JsonOutputParser()
+hallucination_grader = CachedGrader(hallucination_prompt | llm | JsonOutputParser())
 
 
 # ============================================================================
@@ -119,7 +178,7 @@ Output a JSON object with this exact structure:
     input_variables=["question", "generation"]
 )
 
-answer_grader = answer_prompt | llm | JsonOutputParser()
+answer_grader = CachedGrader(answer_prompt | llm | JsonOutputParser())
 
 
 # ============================================================================
@@ -188,6 +188,8 @@ def run_research_query(question: str) -> str:
         "documents": [],
         "web_search_needed": False,
         "synthesis": "",
+        "formatted_documents": "",
+        "formatted_agent_responses": "",
         "hallucination_grade": "",
         "answer_grade": "",
         "iteration_count": 0,
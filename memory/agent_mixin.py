@@ -17,7 +17,7 @@ Usage:
             return super().chat(message)
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from .integration import MemorySystem, MemorySystemConfig
 from .types import MemoryCategory, MemoryStatus
@@ -93,6 +93,25 @@ class MemoryAgentMixin:
         )
         return success
 
+    def remember_many(
+        self,
+        items: List[Tuple[str, MemoryCategory, Optional[str], float]],
+    ) -> List[bool]:
+        """
+        Store several (content, category, source, confidence) items at once.
+
+        Returns one success flag per item, like remember().
+        """
+        if not self.memory_enabled:
+            return [False] * len(items)
+
+        default_source = getattr(self, 'name', 'agent')
+        results = self._memory_system.store_many(
+            (content, category, source or default_source, confidence)
+            for content, category, source, confidence in items
+        )
+        return [success for success, _ in results]
+
     def recall(
         self,
         query: str,
@@ -193,6 +212,17 @@ class MemoryAgentMixin:
         status["enabled"] = True
         return status
 
+    def format_memory_health(self, indent: str = "  ") -> str:
+        """get_memory_health() as indented "key: value" lines, one level per nested dict."""
+        lines = []
+        for key, value in self.get_memory_health().items():
+            if isinstance(value, dict):
+                lines.append(f"{indent}{key}:")
+                lines.extend(f"{indent}  {k}: {v}" for k, v in value.items())
+            else:
+                lines.append(f"{indent}{key}: {value}")
+        return "\n".join(lines)
+
 
 class EnhancedBaseAgent(MemoryAgentMixin):
     """
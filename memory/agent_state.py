@@ -7,12 +7,13 @@ Maintains a separate "agent state" object distinct from memory:
 - This state is what you UPDATE, while memory is what you RETRIEVE
 """
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Iterator, Iterable, Set
 from enum import Enum
-import json
-import hashlib
+
+from .serialization import dumps as json_dumps, loads as json_loads
 
 
 class PolicyVersion(Enum):
@@ -22,28 +23,66 @@ class PolicyVersion(Enum):
     AGGRESSIVE = "aggressive"       # More exploration, less verification
 
 
+# Module-level aliases for identity checks on hot paths
+_NORMAL = PolicyVersion.NORMAL
+_CONSERVATIVE = PolicyVersion.CONSERVATIVE
+
+# Serialized sections of AgentState, in to_dict order
+STATE_SECTIONS = (
+    "goals",
+    "constraints",
+    "assumptions",
+    "open_questions",
+    "environment_flags",
+    "policy_version",
+    "focus_window",
+)
+
+# Quality signal name -> AgentState counter attribute
+_SIGNAL_ATTRS = {
+    "user_correction": "_user_corrections",
+    "tool_retry": "_tool_retries",
+    "verification_failure": "_verification_failures",
+}
+
 @dataclass
 class Assumption:
-    """An explicit assumption with confidence and source."""
+    """
+    An explicit assumption with confidence and source.
+
+    Hashed by content (its identity); the hash is computed once, so
+    confidence/verified stay mutable without affecting set membership.
+    """
     content: str
     confidence: float  # 0.0 to 1.0
     source: str
     created: datetime = field(default_factory=datetime.now)
     verified: bool = False
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._hash = hash(self.content)
 
     def __hash__(self):
-        return hash(self.content)
+        return self._hash
 
 
 @dataclass
 class OpenQuestion:
-    """An unresolved question that may need user clarification."""
+    """An unresolved question that may need user clarification (hashed by question text)."""
     question: str
     context: str
     priority: int = 1  # 1=low, 2=medium, 3=high
     created: datetime = field(default_factory=datetime.now)
     resolved: bool = False
     resolution: Optional[str] = None
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._hash = hash(self.question)
+
+    def __hash__(self):
+        return self._hash
 
 
 @dataclass
@@ -86,18 +125,50 @@ class AgentState:
     _user_corrections: int = 0
     _tool_retries: int = 0
     _verification_failures: int = 0
+    _total_issues: int = 0
+
+    # Reverse index: question text -> OpenQuestion (first added wins)
+    _question_index: Dict[str, OpenQuestion] = field(default_factory=dict, repr=False)
+
+    # Running counts for get_summary
+    _verified_count: int = 0
+    _unresolved_count: int = 0
+
+    # Sections changed since the last to_delta_dict()
+    _dirty: Set[str] = field(default_factory=set, repr=False)
+
+    # Frozen timestamp while inside batch_update(); None = live clock
+    _clock: Optional[datetime] = field(default=None, repr=False, compare=False)
 
     def set_goal(self, goal: str, priority: int = 0) -> None:
         """Set a goal at given priority (0 = highest)."""
         if goal not in self.goals:
             self.goals.insert(priority, goal)
-            self._bump_version()
+            self._bump_version("goals")
+
+    def set_goals_bulk(self, goals: Iterable[str], priority: int = 0) -> int:
+        """
+        Insert several goals at a priority position, keeping their order.
+
+        Equivalent to repeated set_goal calls but bumps the version once.
+        Returns the number of goals added.
+        """
+        seen = set(self.goals)
+        new_goals = []
+        for goal in goals:
+            if goal not in seen:
+                seen.add(goal)
+                new_goals.append(goal)
+        if new_goals:
+            self.goals[priority:priority] = new_goals
+            self._bump_version("goals")
+        return len(new_goals)
 
     def complete_goal(self, goal: str) -> bool:
         """Mark a goal as completed. Returns True if goal existed."""
         if goal in self.goals:
             self.goals.remove(goal)
-            self._bump_version()
+            self._bump_version("goals")
             return True
         return False
 
@@ -105,7 +176,20 @@ class AgentState:
         """Add a hard constraint."""
         if constraint not in self.constraints:
             self.constraints.append(constraint)
-            self._bump_version()
+            self._bump_version("constraints")
+
+    def add_constraints_bulk(self, constraints: Iterable[str]) -> int:
+        """Add several hard constraints with a single version bump."""
+        seen = set(self.constraints)
+        added = 0
+        for constraint in constraints:
+            if constraint not in seen:
+                seen.add(constraint)
+                self.constraints.append(constraint)
+                added += 1
+        if added:
+            self._bump_version("constraints")
+        return added
 
     def add_assumption(
         self,
@@ -114,21 +198,57 @@ class AgentState:
         source: str = "inferred"
     ) -> None:
         """Add a working assumption."""
-        assumption = Assumption(content=content, confidence=confidence, source=source)
+        assumption = Assumption(
+            content=content, confidence=confidence, source=source, created=self._now()
+        )
         # Check for duplicate
         for existing in self.assumptions:
             if existing.content == content:
                 existing.confidence = max(existing.confidence, confidence)
+                self._dirty.add("assumptions")
                 return
         self.assumptions.append(assumption)
-        self._bump_version()
+        self._bump_version("assumptions")
+
+    def add_assumptions_bulk(
+        self,
+        contents: Iterable[str],
+        confidence: float = 0.7,
+        source: str = "inferred"
+    ) -> int:
+        """
+        Add several working assumptions with a single version bump.
+
+        Duplicates keep the higher confidence, as in add_assumption.
+        Returns the number of new assumptions added.
+        """
+        by_content = {a.content: a for a in self.assumptions}
+        added = 0
+        with self.batch_update():
+            for content in contents:
+                existing = by_content.get(content)
+                if existing is not None:
+                    existing.confidence = max(existing.confidence, confidence)
+                    self._dirty.add("assumptions")
+                    continue
+                assumption = Assumption(
+                    content=content, confidence=confidence, source=source, created=self._now()
+                )
+                self.assumptions.append(assumption)
+                by_content[content] = assumption
+                added += 1
+            if added:
+                self._bump_version("assumptions")
+        return added
 
     def verify_assumption(self, content: str) -> bool:
         """Mark an assumption as verified."""
         for assumption in self.assumptions:
             if assumption.content == content:
-                assumption.verified = True
-                self._bump_version()
+                if not assumption.verified:
+                    assumption.verified = True
+                    self._verified_count += 1
+                self._bump_version("assumptions")
                 return True
         return False
 
@@ -137,7 +257,9 @@ class AgentState:
         for i, assumption in enumerate(self.assumptions):
             if assumption.content == content:
                 self.assumptions.pop(i)
-                self._bump_version()
+                if assumption.verified:
+                    self._verified_count -= 1
+                self._bump_version("assumptions")
                 return True
         return False
 
@@ -148,67 +270,107 @@ class AgentState:
         priority: int = 2
     ) -> None:
         """Add an open question."""
-        q = OpenQuestion(question=question, context=context, priority=priority)
+        q = OpenQuestion(
+            question=question, context=context, priority=priority, created=self._now()
+        )
         self.open_questions.append(q)
-        self._bump_version()
+        self._question_index.setdefault(question, q)
+        self._unresolved_count += 1
+        self._bump_version("open_questions")
 
     def resolve_question(self, question: str, resolution: str) -> bool:
         """Resolve an open question."""
+        q = self._question_index.get(question)
+        if q is None:
+            return False
+        if not q.resolved:
+            q.resolved = True
+            self._unresolved_count -= 1
+        q.resolution = resolution
+        self._bump_version("open_questions")
+        return True
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the question index and summary counts from the lists."""
+        self._question_index = {}
+        unresolved = 0
         for q in self.open_questions:
-            if q.question == question:
-                q.resolved = True
-                q.resolution = resolution
-                self._bump_version()
-                return True
-        return False
+            self._question_index.setdefault(q.question, q)
+            if not q.resolved:
+                unresolved += 1
+        self._unresolved_count = unresolved
+        self._verified_count = sum(1 for a in self.assumptions if a.verified)
 
     def set_env_flag(self, key: str, value: Any) -> None:
         """Set an environment flag."""
         self.environment_flags[key] = value
-        self._bump_version()
+        self._bump_version("environment_flags")
 
     def add_to_focus(self, decision: str, rationale: str) -> None:
         """Add a key decision to the rotating focus window."""
         self.focus_window.append({
             "decision": decision,
             "rationale": rationale,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now().isoformat(),
         })
-        # Rotate if exceeds size
+        # Rotate if exceeds size (in place: drops the oldest entry instead of
+        # copying the remaining window into a new list on every append)
         if len(self.focus_window) > self.focus_window_size:
-            self.focus_window = self.focus_window[-self.focus_window_size:]
-        self._bump_version()
+            del self.focus_window[:-self.focus_window_size]
+        self._bump_version("focus_window")
 
     def record_quality_signal(self, signal_type: str) -> None:
         """Record a quality signal for drift detection."""
-        if signal_type == "user_correction":
-            self._user_corrections += 1
-        elif signal_type == "tool_retry":
-            self._tool_retries += 1
-        elif signal_type == "verification_failure":
-            self._verification_failures += 1
+        attr = _SIGNAL_ATTRS.get(signal_type)
+        if attr is not None:
+            setattr(self, attr, getattr(self, attr) + 1)
+            self._total_issues += 1
         self._check_drift()
 
     def _check_drift(self) -> None:
         """Check if quality signals indicate drift - adjust policy."""
-        total_issues = self._user_corrections + self._tool_retries + self._verification_failures
-        if total_issues >= 3 and self.policy_version != PolicyVersion.CONSERVATIVE:
-            self.policy_version = PolicyVersion.CONSERVATIVE
-            self._bump_version()
+        if self.policy_version is _CONSERVATIVE:
+            return
+        if self._total_issues >= 3:
+            self.policy_version = _CONSERVATIVE
+            self._bump_version("policy_version")
 
     def reset_quality_signals(self) -> None:
         """Reset quality signals (after successful task completion)."""
         self._user_corrections = 0
         self._tool_retries = 0
         self._verification_failures = 0
-        if self.policy_version == PolicyVersion.CONSERVATIVE:
-            self.policy_version = PolicyVersion.NORMAL
-            self._bump_version()
-
-    def _bump_version(self) -> None:
-        """Increment version and update timestamp."""
+        self._total_issues = 0
+        if self.policy_version is _CONSERVATIVE:
+            self.policy_version = _NORMAL
+            self._bump_version("policy_version")
+
+    def _bump_version(self, section: Optional[str] = None) -> None:
+        """Increment version, update timestamp and mark section dirty."""
+        if section is not None:
+            self._dirty.add(section)
         self.version += 1
-        self.last_updated = datetime.now()
+        self.last_updated = self._now()
+
+    def _now(self) -> datetime:
+        """Current time, or this state's batch timestamp if one is active."""
+        return self._clock or datetime.now()
+
+    @contextmanager
+    def batch_update(self) -> Iterator["AgentState"]:
+        """
+        Freeze the clock for a batch of mutations.
+
+        Items created and version bumps inside the block share a single
+        timestamp instead of calling datetime.now() per mutation.
+        """
+        previous = self._clock
+        if previous is None:
+            self._clock = datetime.now()
+        try:
+            yield self
+        finally:
+            self._clock = previous
 
     def consolidate(self) -> Dict[str, Any]:
         """
@@ -223,6 +385,7 @@ class AgentState:
         # Prune resolved questions
         self.open_questions = [q for q in self.open_questions if not q.resolved]
         changes["pruned"] = len([q for q in self.open_questions if q.resolved])
+        self._rebuild_indexes()
 
         # Expire old unverified assumptions (>24h)
         now = datetime.now()
@@ -231,11 +394,13 @@ class AgentState:
             age_hours = (now - assumption.created).total_seconds() / 3600
             if not assumption.verified and age_hours > 24:
                 expired.append(assumption)
-        for a in expired:
-            self.assumptions.remove(a)
+        if expired:
+            expired_set = set(expired)
+            self.assumptions = [a for a in self.assumptions if a not in expired_set]
+            self._dirty.add("assumptions")
         changes["expired"] = len(expired)
 
-        self._bump_version()
+        self._bump_version("open_questions")
         return changes
 
     def get_summary(self) -> str:
@@ -245,31 +410,71 @@ class AgentState:
             f"Policy: {self.policy_version.value}",
             f"Goals: {len(self.goals)}",
             f"Constraints: {len(self.constraints)}",
-            f"Assumptions: {len(self.assumptions)} ({sum(1 for a in self.assumptions if a.verified)} verified)",
-            f"Open Questions: {len([q for q in self.open_questions if not q.resolved])}",
+            f"Assumptions: {len(self.assumptions)} ({self._verified_count} verified)",
+            f"Open Questions: {self._unresolved_count}",
             f"Focus Window: {len(self.focus_window)} decisions",
         ]
         return "\n".join(lines)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Serialize to dictionary."""
-        return {
-            "goals": self.goals,
-            "constraints": self.constraints,
-            "assumptions": [
+    def mark_dirty(self, section: str) -> None:
+        """Mark a section as changed (for callers that edit fields directly)."""
+        self._dirty.add(section)
+
+    def _serialize_section(self, section: str) -> Any:
+        """Serialize one of STATE_SECTIONS."""
+        if section == "assumptions":
+            return [
                 {"content": a.content, "confidence": a.confidence, "source": a.source, "verified": a.verified}
                 for a in self.assumptions
-            ],
-            "open_questions": [
+            ]
+        if section == "open_questions":
+            return [
                 {"question": q.question, "context": q.context, "priority": q.priority, "resolved": q.resolved}
                 for q in self.open_questions
-            ],
-            "environment_flags": self.environment_flags,
-            "policy_version": self.policy_version.value,
-            "focus_window": self.focus_window,
-            "version": self.version,
-            "last_updated": self.last_updated.isoformat(),
+            ]
+        if section == "policy_version":
+            return self.policy_version.value
+        return getattr(self, section)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to dictionary."""
+        data = {section: self._serialize_section(section) for section in STATE_SECTIONS}
+        data["version"] = self.version
+        data["last_updated"] = self.last_updated.isoformat()
+        return data
+
+    def to_delta_dict(self) -> Dict[str, Any]:
+        """
+        Serialize only the sections changed since the previous delta.
+
+        policy_version, version and last_updated are always included
+        (policy can be switched directly by DriftMonitor). Apply the result
+        on top of a full to_dict() snapshot with from_delta_dict().
+        """
+        data = {
+            section: self._serialize_section(section)
+            for section in STATE_SECTIONS
+            if section in self._dirty
         }
+        data["policy_version"] = self.policy_version.value
+        data["version"] = self.version
+        data["last_updated"] = self.last_updated.isoformat()
+        self._dirty.clear()
+        return data
+
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        return json_dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data) -> "AgentState":
+        """Deserialize from JSON bytes or text."""
+        return cls.from_dict(json_loads(data))
+
+    @classmethod
+    def from_delta_dict(cls, base: Dict[str, Any], delta: Dict[str, Any]) -> "AgentState":
+        """Rebuild state from a full snapshot plus a to_delta_dict() delta."""
+        return cls.from_dict({**base, **delta})
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AgentState":
@@ -277,17 +482,20 @@ class AgentState:
         state = cls()
         state.goals = data.get("goals", [])
         state.constraints = data.get("constraints", [])
-        state.assumptions = [
-            Assumption(content=a["content"], confidence=a["confidence"], source=a["source"], verified=a["verified"])
-            for a in data.get("assumptions", [])
-        ]
-        state.open_questions = [
-            OpenQuestion(
-                question=q["question"], context=q["context"],
-                priority=q["priority"], resolved=q["resolved"]
-            )
-            for q in data.get("open_questions", [])
-        ]
+        with state.batch_update():
+            state.assumptions = [
+                Assumption(content=a["content"], confidence=a["confidence"], source=a["source"],
+                           verified=a["verified"], created=state._now())
+                for a in data.get("assumptions", [])
+            ]
+            state.open_questions = [
+                OpenQuestion(
+                    question=q["question"], context=q["context"],
+                    priority=q["priority"], resolved=q["resolved"], created=state._now()
+                )
+                for q in data.get("open_questions", [])
+            ]
+        state._rebuild_indexes()
         state.environment_flags = data.get("environment_flags", {})
         state.policy_version = PolicyVersion(data.get("policy_version", "normal"))
         state.focus_window = data.get("focus_window", [])
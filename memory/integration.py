@@ -12,9 +12,11 @@ Design Principles:
 """
 
 import os
+import time
+from itertools import islice
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 
 from .types import MemoryItem, MemoryCategory, MemoryScope, MemoryStatus
 from .tiers import ThreeTierMemory, LongTermMemory, EpisodicTraces, WorkingContext
@@ -28,6 +30,10 @@ from .monitors import (
     FocusWindowManager,
 )
 
+# Longest a cached prompt context is reused while nothing else changes;
+# decay half-lives are hours, so a minute of drift in the ranking is noise
+_PROMPT_CONTEXT_TTL = 60
+
 
 @dataclass
 class MemorySystemConfig:
@@ -62,6 +68,7 @@ class MemorySystem:
 
     def __init__(self, config: Optional[MemorySystemConfig] = None):
         self.config = config or MemorySystemConfig()
+        self._prompt_context_cache: Optional[Tuple[tuple, Dict[str, Any]]] = None
         self._setup_components()
 
     def _setup_components(self) -> None:
@@ -175,6 +182,23 @@ class MemorySystem:
 
         return (memory_id is not None, memory_id)
 
+    def store_many(
+        self,
+        items: Iterable[Tuple[str, MemoryCategory, str, float]],
+        check_contradictions: bool = True,
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Store several (content, category, source, confidence) items.
+
+        Same checks and order as calling store() per item, but the
+        long-term write-ahead log is appended once for the whole batch.
+        """
+        with self.memory.long_term.batch_update():
+            return [
+                self.store(content, category, source, confidence, check_contradictions)
+                for content, category, source, confidence in items
+            ]
+
     def check_and_store(
         self,
         content: str,
@@ -298,6 +322,17 @@ class MemorySystem:
         """Record a key decision to the focus window."""
         self.focus_manager.add_decision(decision, rationale)
 
+    def record_decisions(self, decisions: Iterable[Tuple[str, str]]) -> None:
+        """
+        Record several (decision, rationale) pairs in order.
+
+        The decisions share one timestamp (AgentState.batch_update), and any
+        long-term writes from a consolidation they trigger share one log append.
+        """
+        with self.state.batch_update(), self.memory.long_term.batch_update():
+            for decision, rationale in decisions:
+                self.focus_manager.add_decision(decision, rationale)
+
     def get_state_summary(self) -> str:
         """Get current state summary."""
         return self.state.get_summary()
@@ -404,7 +439,24 @@ class MemorySystem:
         - working_context: Recent ephemeral items
         - relevant_memories: Retrieved long-term memories
         - state_summary: Current goals/constraints/assumptions
+
+        The result is reused until the state, policy, working context or
+        long-term store changes, so repeated calls within a turn are cheap.
+        Decay moves the scores with wall-clock time, so it is also rebuilt
+        at least every _PROMPT_CONTEXT_TTL seconds. Treat the returned dict
+        as read-only.
         """
+        cache_key = (
+            self.state.version,
+            self.state.policy_version,
+            self.memory.working._revision,
+            self.memory.long_term._revision,
+            int(time.time() // _PROMPT_CONTEXT_TTL),
+        )
+        cached = self._prompt_context_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
         # Get working context
         working = self.memory.working.get_context_window()
 
@@ -414,18 +466,20 @@ class MemorySystem:
         # Get state summary
         summary = self.state.get_summary()
 
-        return {
+        context = {
             "working_context": working,
             "relevant_memories": [
                 {"content": s.item.content, "source": s.item.source, "score": s.score}
-                for s in retrieval.items[:5]
+                for s in islice(retrieval.items, 5)
             ],
             "state_summary": summary,
             "needs_verification": [
                 {"content": s.item.content, "reason": s.verification_reason}
-                for s in retrieval.verification_required[:3]
+                for s in islice(retrieval.verification_required, 3)
             ],
         }
+        self._prompt_context_cache = (cache_key, context)
+        return context
 
 
 # Convenience factory functions
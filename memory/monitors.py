@@ -11,16 +11,62 @@ Adaptive procedures to prevent context rot:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, NamedTuple, FrozenSet
 from collections import deque
 from enum import Enum
 import re
 
-from .types import MemoryItem, MemoryCategory, MemoryStatus
+from .types import (
+    MemoryItem, MemoryCategory, MemoryStatus,
+    word_overlap, overlap_exceeds, token_signature, index_terms,
+)
 from .tiers import ThreeTierMemory, LongTermMemory
 from .agent_state import AgentState, PolicyVersion
 
 
+# Number association patterns: "word = 5", "word: 5", "word is 5", "word are 5".
+# Scanned one pattern at a time: in a chain such as "a = 1 is 2" the shared
+# number is both a value and a key, which one combined scan would consume once.
+_NUMBER_PATTERNS = [
+    re.compile(r"(\w+)\s*[=:]\s*([\d.]+)"),
+    re.compile(r"(\w+)\s+is\s+([\d.]+)"),
+    re.compile(r"(\w+)\s+are\s+([\d.]+)"),
+]
+
+
+# Explicit (positive, negative) keyword pairs
+_CONTRADICTION_PHRASES = [
+    ("was", "was not"),
+    ("is", "is not"),
+    ("can", "cannot"),
+    ("true", "false"),
+    ("correct", "incorrect"),
+    ("valid", "invalid"),
+]
+# One scan of the old content finds every negative phrase present. No
+# phrase's suffix is another's prefix, so non-overlapping finditer
+# misses none of them.
+_NEGATIVE_PHRASE_RE = re.compile(
+    "|".join(re.escape(neg) for _, neg in _CONTRADICTION_PHRASES)
+)
+
+# Sentence splitter and hedging/meta-statement filter for atomic facts. The
+# filter matches substrings, so "maybes" and "could bear" are skipped too.
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+_META_STATEMENT_RE = re.compile("i think|maybe|perhaps|might be|could be")
+
+
+class _NewContent(NamedTuple):
+    """New content analyzed once per check, shared across all candidates."""
+    lower: str
+    tokens: FrozenSet[str]
+    signature: int
+    numbers: Dict[str, float]
+    # (matched negation, de-negated text, its word set, signature) per
+    # matching pattern, in order
+    negations: List[Tuple[str, str, FrozenSet[str], int]]
+
+
 class DriftSignal(Enum):
     """Types of drift signals to monitor."""
     USER_CORRECTION = "user_correction"
@@ -50,18 +96,29 @@ class ContradictionDetector:
     - Demotes confidence until verified
     """
 
+    # Substrings every negation pattern needs ("cannot" contains "not");
+    # text without any of them skips the negation regexes entirely
+    NEGATION_TRIGGERS = ("not", "no ", "never")
+
     def __init__(self, memory: LongTermMemory):
         self.memory = memory
-        # Simple negation patterns
+        # Simple negation patterns (compiled once, reused for every candidate)
         self.negation_patterns = [
-            (r"(\w+) is not", r"\1 is"),
-            (r"(\w+) are not", r"\1 are"),
-            (r"(\w+) cannot", r"\1 can"),
-            (r"(\w+) does not", r"\1 does"),
-            (r"(\w+) will not", r"\1 will"),
-            (r"no (\w+)", r"\1"),
-            (r"never (\w+)", r"always \1"),
+            (re.compile(pattern), replacement)
+            for pattern, replacement in [
+                (r"(\w+) is not", r"\1 is"),
+                (r"(\w+) are not", r"\1 are"),
+                (r"(\w+) cannot", r"\1 can"),
+                (r"(\w+) does not", r"\1 does"),
+                (r"(\w+) will not", r"\1 will"),
+                (r"no (\w+)", r"\1"),
+                (r"never (\w+)", r"always \1"),
+            ]
         ]
+        # Union of all negation patterns: one scan rejects the common case
+        self._negation_union = re.compile(
+            "|".join(f"(?:{p.pattern})" for p, _ in self.negation_patterns)
+        )
 
     def check_contradiction(
         self,
@@ -74,21 +131,51 @@ class ContradictionDetector:
         Returns list of (contradicted_item, reason) tuples.
         """
         contradictions = []
+        new = self._analyze_new_content(new_content)
 
-        # Get relevant memories to check
-        filters = {"status": MemoryStatus.ACTIVE}
-        if category:
-            filters["category"] = category
+        # Only memories sharing a term with the new content (or with its
+        # de-negated forms) can trip any of the heuristics below
+        terms = index_terms(new.lower)
+        for _, pos_form, _, _ in new.negations:
+            terms |= index_terms(pos_form)
 
-        candidates = self.memory.query(**filters)
+        candidates = self.memory.query_by_terms(
+            terms, category=category, status=MemoryStatus.ACTIVE
+        )
 
         for item in candidates:
-            contradiction = self._detect_contradiction(new_content, item.content)
+            contradiction = self._find_conflict(
+                new, item.content_lower, item.tokens, item.signature
+            )
             if contradiction:
                 contradictions.append((item, contradiction))
 
         return contradictions
 
+    def _analyze_new_content(self, new_content: str) -> _NewContent:
+        """Lowercase, tokenize, extract numbers and de-negate new content once."""
+        new_lower = new_content.lower()
+        negations = []
+        # Per-pattern pass only if any pattern hits
+        if self._has_negation(new_lower):
+            for neg_pattern, pos_pattern in self.negation_patterns:
+                neg_match = neg_pattern.search(new_lower)
+                if neg_match:
+                    pos_form = neg_pattern.sub(pos_pattern, new_lower)
+                    pos_tokens = frozenset(pos_form.split())
+                    negations.append((
+                        neg_match.group(), pos_form,
+                        pos_tokens, token_signature(pos_tokens),
+                    ))
+        new_tokens = frozenset(new_lower.split())
+        return _NewContent(
+            lower=new_lower,
+            tokens=new_tokens,
+            signature=token_signature(new_tokens),
+            numbers=self._extract_numbers(new_lower),
+            negations=negations,
+        )
+
     def _detect_contradiction(self, new_content: str, old_content: str) -> Optional[str]:
         """
         Detect if two pieces of content contradict each other.
@@ -98,65 +185,74 @@ class ContradictionDetector:
         - Numeric value conflicts
         - Keyword conflicts
         """
-        new_lower = new_content.lower()
         old_lower = old_content.lower()
+        old_tokens = frozenset(old_lower.split())
+        return self._find_conflict(
+            self._analyze_new_content(new_content),
+            old_lower,
+            old_tokens,
+            token_signature(old_tokens),
+        )
+
+    def _find_conflict(
+        self,
+        new: _NewContent,
+        old_lower: str,
+        old_tokens: FrozenSet[str],
+        old_signature: int,
+    ) -> Optional[str]:
+        """Run the contradiction heuristics against one stored memory."""
+        new_lower = new.lower
 
         # Check negation patterns
-        for neg_pattern, pos_pattern in self.negation_patterns:
-            neg_match = re.search(neg_pattern, new_lower)
-            if neg_match:
-                # Check if old content has the positive form
-                pos_form = re.sub(neg_pattern, pos_pattern, new_lower)
-                if self._content_overlap(pos_form, old_lower) > 0.5:
-                    return f"negation conflict: '{neg_match.group()}'"
+        for matched, _, pos_tokens, pos_signature in new.negations:
+            # Check if old content has the positive form
+            if overlap_exceeds(pos_tokens, pos_signature, old_tokens, old_signature, 0.5):
+                return f"negation conflict: '{matched}'"
 
         # Check numeric conflicts (e.g., "X = 5" vs "X = 10")
-        new_numbers = self._extract_numbers(new_lower)
+        new_numbers = new.numbers
         old_numbers = self._extract_numbers(old_lower)
         for key in new_numbers.keys() & old_numbers.keys():
             if new_numbers[key] != old_numbers[key]:
                 return f"numeric conflict for '{key}': {new_numbers[key]} vs {old_numbers[key]}"
 
         # Check for explicit contradiction keywords
-        contradiction_phrases = [
-            ("was", "was not"),
-            ("is", "is not"),
-            ("can", "cannot"),
-            ("true", "false"),
-            ("correct", "incorrect"),
-            ("valid", "invalid"),
-        ]
-        for pos, neg in contradiction_phrases:
-            if pos in new_lower and neg in old_lower:
-                # Check if they're about the same subject
-                if self._content_overlap(new_lower, old_lower) > 0.3:
-                    return f"potential conflict: '{pos}' vs '{neg}'"
+        negatives = {m.group() for m in _NEGATIVE_PHRASE_RE.finditer(old_lower)}
+        if negatives:
+            for pos, neg in _CONTRADICTION_PHRASES:
+                if neg in negatives and pos in new_lower:
+                    # Check if they're about the same subject. The overlap
+                    # does not depend on the pair, so only the first hit matters.
+                    if overlap_exceeds(new.tokens, new.signature, old_tokens, old_signature, 0.3):
+                        return f"potential conflict: '{pos}' vs '{neg}'"
+                    break
 
         return None
 
+    def _has_negation(self, text_lower: str) -> bool:
+        """Whether any negation pattern matches (substring gate, then one regex)."""
+        return (
+            any(trigger in text_lower for trigger in self.NEGATION_TRIGGERS)
+            and self._negation_union.search(text_lower) is not None
+        )
+
     def _content_overlap(self, content1: str, content2: str) -> float:
         """Simple word overlap similarity."""
-        words1 = set(content1.split())
-        words2 = set(content2.split())
-        if not words1 or not words2:
-            return 0.0
-        return len(words1 & words2) / max(len(words1), len(words2))
+        return word_overlap(set(content1.split()), set(content2.split()))
 
     def _extract_numbers(self, text: str) -> Dict[str, float]:
         """Extract number associations from text."""
-        # Pattern: word/phrase = number or word/phrase is number
-        patterns = [
-            r"(\w+)\s*[=:]\s*([\d.]+)",
-            r"(\w+)\s+is\s+([\d.]+)",
-            r"(\w+)\s+are\s+([\d.]+)",
-        ]
+        # Pattern: word/phrase = number or word/phrase is number. Later
+        # patterns take precedence for a repeated key ("=" < "is" < "are")
         numbers = {}
-        for pattern in patterns:
-            for match in re.finditer(pattern, text):
-                try:
-                    numbers[match.group(1)] = float(match.group(2))
-                except ValueError:
-                    pass
+        for pattern in _NUMBER_PATTERNS:
+            for key, value in pattern.findall(text):
+                # [\d.]+ already excludes everything float() rejects except
+                # a bare "." or more than one dot
+                if value.count(".") > 1 or value == ".":
+                    continue
+                numbers[key] = float(value)
         return numbers
 
     def reconcile(
@@ -209,14 +305,23 @@ class DriftMonitor:
         self.alert_threshold = alert_threshold
         self._signal_window: deque = deque(maxlen=window_size)
         self._last_check = datetime.now()
+        # Running aggregates over the window, updated on append/evict
+        self._signal_counts: Dict[DriftSignal, int] = {}
+        self._total_severity = 0
 
     def record_signal(self, signal: DriftSignal, details: str = "", severity: int = 1) -> None:
         """Record a quality signal."""
+        if len(self._signal_window) == self._signal_window.maxlen:
+            evicted = self._signal_window[0]
+            self._signal_counts[evicted.signal_type] -= 1
+            self._total_severity -= evicted.severity
         self._signal_window.append(QualitySignal(
             signal_type=signal,
             details=details,
             severity=severity,
         ))
+        self._signal_counts[signal] = self._signal_counts.get(signal, 0) + 1
+        self._total_severity += severity
         self._check_drift()
 
     def _check_drift(self) -> Optional[Dict[str, Any]]:
@@ -224,12 +329,8 @@ class DriftMonitor:
         if len(self._signal_window) < 5:
             return None
 
-        # Count signals by type
-        signal_counts = {}
-        total_severity = 0
-        for sig in self._signal_window:
-            signal_counts[sig.signal_type] = signal_counts.get(sig.signal_type, 0) + 1
-            total_severity += sig.severity
+        signal_counts = self._signal_counts
+        total_severity = self._total_severity
 
         # Check thresholds
         drift_detected = False
@@ -265,7 +366,7 @@ class DriftMonitor:
         }
 
         # Switch to conservative policy
-        if self.state.policy_version != PolicyVersion.CONSERVATIVE:
+        if self.state.policy_version is not PolicyVersion.CONSERVATIVE:
             self.state.policy_version = PolicyVersion.CONSERVATIVE
             response["actions"].append("switched to conservative policy")
 
@@ -282,11 +383,10 @@ class DriftMonitor:
 
     def get_health_summary(self) -> Dict[str, Any]:
         """Get current health summary."""
-        signal_counts = {}
-        for sig in self._signal_window:
-            signal_counts[sig.signal_type.value] = signal_counts.get(sig.signal_type.value, 0) + 1
-
-        total_severity = sum(s.severity for s in self._signal_window)
+        signal_counts = {
+            sig.value: count for sig, count in self._signal_counts.items() if count
+        }
+        total_severity = self._total_severity
 
         return {
             "window_size": len(self._signal_window),
@@ -299,6 +399,8 @@ class DriftMonitor:
     def reset(self) -> None:
         """Reset the monitor (after successful task completion)."""
         self._signal_window.clear()
+        self._signal_counts.clear()
+        self._total_severity = 0
         self.state.reset_quality_signals()
 
 
@@ -341,12 +443,9 @@ Open Questions: {questions}
         decisions_str = "\n".join(decisions) if decisions else "None recorded"
 
         # Get evidence from recent memories
-        recent = self.memory.long_term.query(
-            status=MemoryStatus.ACTIVE,
-            min_confidence=0.7,
-        )
+        recent = self.memory.long_term.top_recent_active(5, min_confidence=0.7)
         evidence = []
-        for item in sorted(recent, key=lambda x: x.timestamp, reverse=True)[:5]:
+        for item in recent:
             evidence.append(f"- [{item.category.value}] {item.content[:100]}")
         evidence_str = "\n".join(evidence) if evidence else "None stored"
 
@@ -375,7 +474,7 @@ Open Questions: {questions}
         facts = []
 
         # Split by sentence
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
 
         for sentence in sentences:
             sentence = sentence.strip()
@@ -383,8 +482,7 @@ Open Questions: {questions}
                 continue
 
             # Skip meta-statements
-            skip_patterns = ["I think", "maybe", "perhaps", "might be", "could be"]
-            if any(p in sentence.lower() for p in skip_patterns):
+            if _META_STATEMENT_RE.search(sentence.lower()):
                 continue
 
             # Clean and add
@@ -442,14 +540,17 @@ class FocusWindowManager:
         if len(self.state.focus_window) > self.max_decisions:
             overflow = self.state.focus_window[:-self.max_decisions]
             self.state.focus_window = self.state.focus_window[-self.max_decisions:]
+            self.state.mark_dirty("focus_window")
 
-            for item in overflow:
-                self.memory.episodic.record(
+            self.memory.episodic.record_batch(
+                (
                     "decision_archived",
                     f"Decision: {item['decision']}",
                     {"rationale": item["rationale"], "timestamp": item["timestamp"]},
                 )
-                report["archived"] += 1
+                for item in overflow
+            )
+            report["archived"] += len(overflow)
 
         # Promote frequently accessed, high-confidence assumptions to memory
         for assumption in list(self.state.assumptions):
@@ -468,12 +569,15 @@ class FocusWindowManager:
 
         # Prune expired long-term memories
         expired_memories = self.memory.long_term.prune_expired()
-        for mem in expired_memories:
-            self.memory.episodic.record(
+        now = datetime.now()
+        self.memory.episodic.record_batch(
+            (
                 "memory_expired",
                 f"Expired: {mem.content[:100]}",
-                {"category": mem.category.value, "age_hours": mem.age_hours},
+                {"category": mem.category.value, "age_hours": mem.age_hours_at(now)},
             )
+            for mem in expired_memories
+        )
 
         self._operation_count = 0
         return report
@@ -10,10 +10,11 @@ Retrieval that does not rot: "policy + gating"
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, Callable
 from enum import Enum
+import heapq
 
-from .types import MemoryItem, MemoryCategory, MemoryScope, MemoryStatus
+from .types import MemoryItem, MemoryCategory, MemoryScope, MemoryStatus, word_overlap, overlap_exceeds
 from .tiers import ThreeTierMemory
 from .agent_state import AgentState, PolicyVersion
 
@@ -36,6 +37,65 @@ INTENT_CATEGORY_MAP = {
     RetrievalIntent.CONTEXT_RECALL: [MemoryCategory.CONTEXTUAL, MemoryCategory.DECISION],
 }
 
+# Policy -> threshold tables (built once, looked up per retrieval)
+CONFIDENCE_THRESHOLDS = {
+    PolicyVersion.NORMAL: 0.5,
+    PolicyVersion.CONSERVATIVE: 0.7,
+    PolicyVersion.AGGRESSIVE: 0.3,
+}
+
+VERIFICATION_THRESHOLDS = {
+    PolicyVersion.NORMAL: 0.6,
+    PolicyVersion.CONSERVATIVE: 0.8,
+    PolicyVersion.AGGRESSIVE: 0.4,
+}
+
+_CONSERVATIVE = PolicyVersion.CONSERVATIVE
+
+# Source type (prefix before ":") -> source quality score
+SOURCE_SCORES = {
+    "user_input": 1.0,
+    "verified_tool": 0.9,
+    "web_search": 0.6,
+    "inferred": 0.5,
+    "unknown": 0.3,
+}
+
+
+# Verification reason flags (bitmask on ScoredMemory.verify_flags)
+VERIFY_CONTESTED = 1
+VERIFY_DECAYED = 2
+VERIFY_LOW_CONFIDENCE = 4
+VERIFY_NO_REFS = 8
+
+
+def _verification_flags(item: MemoryItem, decay: float) -> int:
+    """Bitmask of the reasons an item needs verification."""
+    flags = 0
+    if item.status == MemoryStatus.CONTESTED:
+        flags |= VERIFY_CONTESTED
+    if decay < 0.5:
+        flags |= VERIFY_DECAYED
+    if item.confidence < 0.6:
+        flags |= VERIFY_LOW_CONFIDENCE
+    if not item.evidence_refs:
+        flags |= VERIFY_NO_REFS
+    return flags
+
+
+def _format_verification_reason(item: MemoryItem, flags: int) -> str:
+    """Render verification flags as a human-readable reason."""
+    reasons = []
+    if flags & VERIFY_CONTESTED:
+        reasons.append("contested by new evidence")
+    if flags & VERIFY_DECAYED:
+        reasons.append(f"aged ({item.age_hours:.0f}h old)")
+    if flags & VERIFY_LOW_CONFIDENCE:
+        reasons.append(f"low confidence ({item.confidence:.2f})")
+    if flags & VERIFY_NO_REFS:
+        reasons.append("no evidence refs")
+    return "; ".join(reasons) if reasons else "policy requirement"
+
 
 @dataclass
 class ScoredMemory:
@@ -43,7 +103,14 @@ class ScoredMemory:
     item: MemoryItem
     score: float
     needs_verification: bool = False
-    verification_reason: Optional[str] = None
+    verify_flags: int = 0
+
+    @property
+    def verification_reason(self) -> Optional[str]:
+        """Reason verification is needed, formatted on first access."""
+        if not self.needs_verification:
+            return None
+        return _format_verification_reason(self.item, self.verify_flags)
 
 
 @dataclass
@@ -104,41 +171,39 @@ class GatedRetrieval:
         # Get category filter from intent
         categories = INTENT_CATEGORY_MAP.get(intent, list(MemoryCategory))
 
-        # Query long-term memory
-        candidates = []
-        for category in categories:
-            items = self.memory.long_term.query(
-                category=category,
-                status=MemoryStatus.ACTIVE,
-                min_confidence=confidence_threshold,
-            )
-            candidates.extend(items)
+        # Query long-term memory (one pass for all intent categories)
+        candidates = self.memory.long_term.query(
+            categories=categories,
+            status=MemoryStatus.ACTIVE,
+            min_confidence=confidence_threshold,
+        )
 
-        # Score candidates
+        # Score candidates (query tokens and clock read once per retrieve,
+        # decay once per item)
+        query_words = set(query.lower().split()) if query else None
+        now = datetime.now()
         scored = []
         for item in candidates:
-            score = self._compute_score(item, query, intent)
+            decay = item.decay_at(now)
+            score = self._score_item(item, decay, query_words)
             needs_verify = (
-                item.needs_verification or
-                score < verification_threshold or
-                item.decay_factor < 0.5
+                decay < 0.5 or
+                item.status is MemoryStatus.EXPIRED or
+                item.status is MemoryStatus.CONTESTED or
+                score < verification_threshold
             )
-            verify_reason = None
-            if needs_verify:
-                verify_reason = self._get_verification_reason(item)
-
             scored.append(ScoredMemory(
                 item=item,
                 score=score,
                 needs_verification=needs_verify,
-                verification_reason=verify_reason,
+                verify_flags=_verification_flags(item, decay) if needs_verify else 0,
             ))
 
-        # Sort by score descending
-        scored.sort(key=lambda x: x.score, reverse=True)
-
-        # Apply diversity filter (avoid near-duplicates)
-        diverse = self._apply_diversity(scored)
+        # Apply diversity filter (avoid near-duplicates) over a lazily
+        # ranked stream: only the items the budget can use get ordered
+        diverse = self._apply_diversity(
+            self._rank_by_score(scored), limit=self.max_items * 2
+        )
 
         # Apply budget constraints
         final, budget_exceeded = self._apply_budget(diverse)
@@ -174,34 +239,36 @@ class GatedRetrieval:
         - Confidence
         - Scope match
         """
+        query_words = set(query.lower().split()) if query else None
+        return self._score_item(item, item.decay_factor, query_words)
+
+    @staticmethod
+    def _score_item(
+        item: MemoryItem,
+        decay: float,
+        query_words: Optional[set],
+    ) -> float:
+        """Score one item given its precomputed decay factor and query word set."""
         score = 0.0
 
         # Base confidence score
         score += item.confidence * 0.3
 
         # Recency (decay factor)
-        score += item.decay_factor * 0.25
+        score += decay * 0.25
 
         # Source quality
-        source_scores = {
-            "user_input": 1.0,
-            "verified_tool": 0.9,
-            "web_search": 0.6,
-            "inferred": 0.5,
-            "unknown": 0.3,
-        }
-        source_type = item.source.split(":")[0] if ":" in item.source else item.source
-        score += source_scores.get(source_type, 0.5) * 0.2
+        source = item.source
+        source_type = source.split(":", 1)[0] if ":" in source else source
+        score += SOURCE_SCORES.get(source_type, 0.5) * 0.2
 
         # Access frequency (popular items are likely useful)
         access_score = min(item.access_count / 10, 1.0)
         score += access_score * 0.1
 
         # Relevance to query (simple word overlap)
-        if query:
-            query_words = set(query.lower().split())
-            content_words = set(item.content.lower().split())
-            overlap = len(query_words & content_words) / max(len(query_words), 1)
+        if query_words is not None:
+            overlap = len(query_words & item.tokens) / max(len(query_words), 1)
             score += overlap * 0.15
 
         return min(score, 1.0)
@@ -210,64 +277,63 @@ class GatedRetrieval:
         """Get confidence threshold based on policy."""
         if override is not None:
             return override
-
-        policy_thresholds = {
-            PolicyVersion.NORMAL: 0.5,
-            PolicyVersion.CONSERVATIVE: 0.7,
-            PolicyVersion.AGGRESSIVE: 0.3,
-        }
-        return policy_thresholds[self.state.policy_version]
+        return CONFIDENCE_THRESHOLDS[self.state.policy_version]
 
     def _get_verification_threshold(self) -> float:
         """Get verification threshold based on policy."""
-        policy_thresholds = {
-            PolicyVersion.NORMAL: 0.6,
-            PolicyVersion.CONSERVATIVE: 0.8,
-            PolicyVersion.AGGRESSIVE: 0.4,
-        }
-        return policy_thresholds[self.state.policy_version]
+        return VERIFICATION_THRESHOLDS[self.state.policy_version]
 
     def _get_verification_reason(self, item: MemoryItem) -> str:
         """Get reason why verification is needed."""
-        reasons = []
-        if item.status == MemoryStatus.CONTESTED:
-            reasons.append("contested by new evidence")
-        if item.decay_factor < 0.5:
-            reasons.append(f"aged ({item.age_hours:.0f}h old)")
-        if item.confidence < 0.6:
-            reasons.append(f"low confidence ({item.confidence:.2f})")
-        if not item.evidence_refs:
-            reasons.append("no evidence refs")
-        return "; ".join(reasons) if reasons else "policy requirement"
-
-    def _apply_diversity(self, scored: List[ScoredMemory]) -> List[ScoredMemory]:
-        """Remove near-duplicate memories, keeping highest scored."""
-        if len(scored) <= 1:
-            return scored
-
-        diverse = [scored[0]]
-        for candidate in scored[1:]:
+        return _format_verification_reason(
+            item, _verification_flags(item, item.decay_factor)
+        )
+
+    @staticmethod
+    def _rank_by_score(scored: List[ScoredMemory]) -> Iterator[ScoredMemory]:
+        """
+        Yield items by descending score, ties in original order.
+
+        Same order as a stable reverse sort, but heap-based: O(N) to build
+        plus O(log N) per item actually consumed.
+        """
+        heap = [(-s.score, i, s) for i, s in enumerate(scored)]
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[2]
+
+    def _apply_diversity(
+        self,
+        scored: Iterable[ScoredMemory],
+        limit: Optional[int] = None,
+    ) -> List[ScoredMemory]:
+        """
+        Remove near-duplicate memories, keeping highest scored.
+
+        Expects items in descending score order; stops once limit are kept.
+        Uses cached token sets and bit signatures, so most non-duplicate
+        pairs are rejected without a set intersection (see overlap_exceeds).
+        """
+        diverse: List[ScoredMemory] = []
+        for candidate in scored:
+            item = candidate.item
+            tokens = item.tokens
+            sig = item.signature
             is_duplicate = False
             for existing in diverse:
-                similarity = self._content_similarity(
-                    candidate.item.content,
-                    existing.item.content
-                )
-                if similarity > 0.8:
+                other = existing.item
+                if overlap_exceeds(tokens, sig, other.tokens, other.signature, 0.8):
                     is_duplicate = True
                     break
             if not is_duplicate:
                 diverse.append(candidate)
+                if limit is not None and len(diverse) >= limit:
+                    break
         return diverse
 
     def _content_similarity(self, content1: str, content2: str) -> float:
         """Simple word overlap similarity."""
-        words1 = set(content1.lower().split())
-        words2 = set(content2.lower().split())
-        if not words1 or not words2:
-            return 0.0
-        overlap = len(words1 & words2)
-        return overlap / max(len(words1), len(words2))
+        return word_overlap(set(content1.lower().split()), set(content2.lower().split()))
 
     def _apply_budget(
         self,
@@ -279,7 +345,7 @@ class GatedRetrieval:
         budget_exceeded = False
 
         for item in scored[:self.max_items * 2]:  # Consider more than max
-            item_tokens = len(item.item.content.split()) * 1.3  # Rough estimate
+            item_tokens = item.item.approx_tokens
             if total_tokens + item_tokens <= self.max_tokens:
                 result.append(item)
                 total_tokens += item_tokens
@@ -292,6 +358,49 @@ class GatedRetrieval:
         return result, budget_exceeded
 
 
+def _compile_should_verify(
+    policy: PolicyVersion,
+) -> Callable[[MemoryItem, datetime], Tuple[bool, str]]:
+    """Build a should_verify check with the policy branch resolved up front."""
+    contested = MemoryStatus.CONTESTED
+    environmental = MemoryCategory.ENVIRONMENTAL
+
+    def check_common(item: MemoryItem, now: datetime) -> Optional[Tuple[bool, str]]:
+        # Always verify contested items
+        if item.status is contested:
+            return True, "contested"
+        # Check decay
+        decay = item.decay_at(now)
+        if decay < 0.5:
+            return True, f"decayed ({decay:.2f})"
+        return None
+
+    def check_environmental(item: MemoryItem, now: datetime) -> Tuple[bool, str]:
+        # Environmental items need frequent verification
+        if item.category is environmental and item.age_hours_at(now) > 12:
+            return True, "environmental: needs refresh"
+        return False, ""
+
+    if policy is _CONSERVATIVE:
+        def should_verify(item: MemoryItem, now: datetime) -> Tuple[bool, str]:
+            result = check_common(item, now)
+            if result is not None:
+                return result
+            if item.confidence < 0.8:
+                return True, "policy: conservative mode"
+            if not item.evidence_refs:
+                return True, "policy: no evidence"
+            return check_environmental(item, now)
+    else:
+        def should_verify(item: MemoryItem, now: datetime) -> Tuple[bool, str]:
+            result = check_common(item, now)
+            if result is not None:
+                return result
+            return check_environmental(item, now)
+
+    return should_verify
+
+
 class VerificationGate:
     """
     Verification gate for memories that need freshness check.
@@ -304,30 +413,18 @@ class VerificationGate:
 
     def __init__(self, state: AgentState):
         self.state = state
+        self._policy = state.policy_version
+        self._should_verify = _compile_should_verify(self._policy)
 
     def should_verify(self, item: MemoryItem) -> Tuple[bool, str]:
         """Check if memory should be verified before use."""
-        # Always verify contested items
-        if item.status == MemoryStatus.CONTESTED:
-            return True, "contested"
-
-        # Check decay
-        if item.decay_factor < 0.5:
-            return True, f"decayed ({item.decay_factor:.2f})"
-
-        # Policy-based verification
-        if self.state.policy_version == PolicyVersion.CONSERVATIVE:
-            if item.confidence < 0.8:
-                return True, "policy: conservative mode"
-            if not item.evidence_refs:
-                return True, "policy: no evidence"
-
-        # Environmental items need frequent verification
-        if item.category == MemoryCategory.ENVIRONMENTAL:
-            if item.age_hours > 12:
-                return True, "environmental: needs refresh"
-
-        return False, ""
+        policy = self.state.policy_version
+        if policy is not self._policy:
+            # Re-specialize only when the policy changes
+            self._should_verify = _compile_should_verify(policy)
+            self._policy = policy
+        # One clock read serves both the decay and the age check
+        return self._should_verify(item, datetime.now())
 
     def create_verification_prompt(self, item: MemoryItem) -> str:
         """Create a prompt for verifying a memory item."""
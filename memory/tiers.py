@@ -2,18 +2,60 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Set, Tuple
 from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+import bisect
+import heapq
 import json
 import os
+import re
 
+from .serialization import dumps as json_dumps, loads as json_loads
 from .types import (
     MemoryItem, EpisodicTrace, MemoryCategory, MemoryScope,
-    MemoryStatus, DO_NOT_STORE_PATTERNS
+    MemoryStatus, DO_NOT_STORE_PATTERNS, index_terms, overlap_exceeds,
+    short_hash, word_overlap, DATACLASS_SLOTS,
 )
 
+# Minimum write-ahead log length before LongTermMemory compacts it
+_WAL_COMPACT_MIN_OPS = 64
 
-@dataclass
+
+@lru_cache(maxsize=1)
+def _do_not_store_re(patterns: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    """One alternation over all do-not-store patterns (recompiled if the list changes)."""
+    if not patterns:
+        return None
+    return re.compile("|".join(re.escape(p) for p in patterns))
+
+
+def _append_json_lines(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Append records as JSON lines with a single write; returns the count."""
+    lines = [json_dumps(record) + b"\n" for record in records]
+    if lines:
+        with open(path, 'ab') as f:
+            f.write(b"".join(lines))
+    return len(lines)
+
+
+def _read_json_lines(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSON-lines log, stopping at a torn final write."""
+    try:
+        with open(path, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
+        try:
+            yield json_loads(line)
+        except json.JSONDecodeError:
+            break
+
+
+@dataclass(**DATACLASS_SLOTS)
 class WorkingContext:
     """
     Tier 1: Ephemeral working context.
@@ -27,8 +69,9 @@ class WorkingContext:
 
     _items: deque = field(default_factory=lambda: deque(maxlen=20))
     _current_task: Optional[str] = None
-    _user_constraints: List[str] = field(default_factory=list)
+    _user_constraints: deque = field(default_factory=lambda: deque(maxlen=5))
     _tool_outputs: deque = field(default_factory=lambda: deque(maxlen=5))
+    _revision: int = 0  # Bumped on every mutation (used as a cache key)
 
     def add(self, content: str, source: str = "context") -> None:
         """Add item to working context, respecting size budget."""
@@ -41,16 +84,17 @@ class WorkingContext:
             "source": source,
             "timestamp": datetime.now().isoformat(),
         })
+        self._revision += 1
 
     def set_task(self, task: str) -> None:
         """Set current task focus."""
         self._current_task = task
+        self._revision += 1
 
     def add_constraint(self, constraint: str) -> None:
         """Add user constraint (limit to last 5)."""
         self._user_constraints.append(constraint)
-        if len(self._user_constraints) > 5:
-            self._user_constraints = self._user_constraints[-5:]
+        self._revision += 1
 
     def add_tool_output(self, tool_name: str, output_summary: str) -> None:
         """Add summarized tool output (not raw)."""
@@ -59,13 +103,14 @@ class WorkingContext:
             "summary": output_summary[:200],  # Max 200 chars
             "timestamp": datetime.now().isoformat(),
         })
+        self._revision += 1
 
     def get_context_window(self) -> Dict[str, Any]:
         """Get current working context for retrieval."""
         return {
             "current_task": self._current_task,
-            "user_constraints": self._user_constraints,
-            "recent_items": list(self._items)[-10:],
+            "user_constraints": list(self._user_constraints),
+            "recent_items": list(islice(reversed(self._items), 10))[::-1],
             "tool_outputs": list(self._tool_outputs),
         }
 
@@ -73,8 +118,9 @@ class WorkingContext:
         """Clear working context (start new task)."""
         self._items.clear()
         self._current_task = None
-        self._user_constraints = []
+        self._user_constraints.clear()
         self._tool_outputs.clear()
+        self._revision += 1
 
 
 class LongTermMemory:
@@ -88,46 +134,158 @@ class LongTermMemory:
     def __init__(self, persist_path: Optional[str] = None):
         self._store: Dict[str, MemoryItem] = {}
         self._persist_path = persist_path
-        if persist_path and os.path.exists(persist_path):
+        self._revision = 0  # Bumped on every mutation (used as a cache key)
+        # Inverted index: term -> ids of items containing it
+        self._term_index: Dict[str, Set[str]] = {}
+        self._item_terms: Dict[str, Set[str]] = {}
+        # Insertion order, so indexed lookups return items in store order
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        # (timestamp, -seq, id) ascending; read newest-first by top_recent_active
+        self._by_time: List[tuple] = []
+        # category -> ids in store order, so category-filtered queries only
+        # visit matching items (category never changes after creation)
+        self._by_category: Dict[MemoryCategory, Dict[str, None]] = {}
+        # status -> ids; kept current by _set_status, which every status
+        # change made by this class goes through
+        self._by_status: Dict[MemoryStatus, Set[str]] = {}
+        # Mutations are appended to <persist_path>.wal and folded into the
+        # snapshot at persist_path once the log outgrows the store
+        self._wal_path = f"{persist_path}.wal" if persist_path else None
+        self._wal_ops = 0
+        # Ops held back by batch_update(), appended in one write on exit
+        self._pending_ops: Optional[List[Dict[str, Any]]] = None
+        if persist_path and (os.path.exists(persist_path) or os.path.exists(self._wal_path)):
             self._load()
 
-    def _should_store(self, content: str) -> bool:
-        """Check if content should be stored (filter transient items)."""
-        content_lower = content.lower()
-        for pattern in DO_NOT_STORE_PATTERNS:
-            if pattern in content_lower:
-                return False
-        return True
+    def _insert(self, item: MemoryItem) -> None:
+        """Add an item to the store and the term/time/category indexes."""
+        previous = self._store.get(item.id)
+        if previous is not None:
+            self._unindex(item.id)
+            if previous.category != item.category:
+                del self._by_category[previous.category][item.id]
+                self._add_to_category(item, keep_order=True)
+        else:
+            self._seq[item.id] = self._next_seq
+            self._next_seq += 1
+            self._add_to_category(item)
+        self._store[item.id] = item
+        self._index_status(item.id, item.status)
+        terms = index_terms(item.content_lower)
+        self._item_terms[item.id] = terms
+        for term in terms:
+            self._term_index.setdefault(term, set()).add(item.id)
+        bisect.insort(self._by_time, self._time_key(item))
+
+    def _add_to_category(self, item: MemoryItem, keep_order: bool = False) -> None:
+        ids = self._by_category.setdefault(item.category, {})
+        ids[item.id] = None
+        if keep_order:
+            # Re-inserted under a new category: restore store order
+            ordered = sorted(ids, key=self._seq.__getitem__)
+            ids.clear()
+            ids.update(dict.fromkeys(ordered))
+
+    def _index_status(self, memory_id: str, status: Optional[MemoryStatus]) -> None:
+        for ids in self._by_status.values():
+            ids.discard(memory_id)
+        if status is not None:
+            self._by_status.setdefault(status, set()).add(memory_id)
+
+    def _set_status(self, item: MemoryItem, status: MemoryStatus) -> None:
+        """Change an item's status and keep the status index in step."""
+        item.status = status
+        if item.id in self._store:
+            self._index_status(item.id, status)
+
+    def _time_key(self, item: MemoryItem) -> tuple:
+        return (item.timestamp, -self._seq[item.id], item.id)
+
+    def _unindex(self, memory_id: str) -> None:
+        """Drop an item from the term and time indexes (item must still be stored)."""
+        key = self._time_key(self._store[memory_id])
+        pos = bisect.bisect_left(self._by_time, key)
+        if pos < len(self._by_time) and self._by_time[pos] == key:
+            del self._by_time[pos]
+        for term in self._item_terms.pop(memory_id, ()):
+            postings = self._term_index.get(term)
+            if postings is not None:
+                postings.discard(memory_id)
+                if not postings:
+                    del self._term_index[term]
+
+    def _remove(self, memory_id: str) -> None:
+        """Remove an item from the store and all indexes."""
+        self._unindex(memory_id)
+        del self._by_category[self._store[memory_id].category][memory_id]
+        self._index_status(memory_id, None)
+        self._seq.pop(memory_id, None)
+        del self._store[memory_id]
+
+    def _should_store(self, content_lower: str) -> bool:
+        """Check if lowercased content should be stored (filter transient items)."""
+        pattern = _do_not_store_re(tuple(DO_NOT_STORE_PATTERNS))
+        return pattern is None or pattern.search(content_lower) is None
 
     def store(self, item: MemoryItem) -> bool:
         """
         Store a memory item if it passes filters.
         Returns True if stored, False if rejected.
         """
-        if not self._should_store(item.content):
+        if not self._should_store(item.content_lower):
             return False
 
         # Check for duplicates
-        for existing in self._store.values():
-            if self._is_similar(item.content, existing.content):
-                # Update existing instead of creating duplicate
-                existing.access_count += 1
-                existing.last_accessed = datetime.now()
-                return False
+        existing = self._find_duplicate(item)
+        if existing is not None:
+            # Update existing instead of creating duplicate
+            existing.access_count += 1
+            existing.last_accessed = datetime.now()
+            # Access stats feed the retrieval score, so cached rankings are stale
+            self._revision += 1
+            self._log_put(existing)
+            return False
 
-        self._store[item.id] = item
-        self._persist()
+        self._insert(item)
+        self._revision += 1
+        self._log_put(item)
         return True
 
+    def _find_duplicate(self, item: MemoryItem, threshold: float = 0.8) -> Optional[MemoryItem]:
+        """
+        First stored item (in store order) whose word overlap with item
+        exceeds threshold, or None.
+
+        A duplicate must share more than threshold * len(tokens) of the new
+        item's tokens, so it must contain at least one of any
+        len(tokens) - floor(threshold * len(tokens)) of them. Probing the
+        term index with that many of the rarest tokens yields every
+        possible duplicate; only those candidates get the full check.
+        """
+        tokens = item.tokens
+        if not tokens:
+            return None
+        probes = len(tokens) - int(threshold * len(tokens))
+        postings = sorted(
+            (self._term_index.get(token, ()) for token in tokens), key=len
+        )[:probes]
+        candidates: Set[str] = set()
+        for ids in postings:
+            candidates.update(ids)
+        sig = item.signature
+        for memory_id in sorted(candidates, key=self._seq.__getitem__):
+            existing = self._store[memory_id]
+            if overlap_exceeds(tokens, sig, existing.tokens, existing.signature, threshold):
+                return existing
+        return None
+
     def _is_similar(self, content1: str, content2: str, threshold: float = 0.8) -> bool:
         """Simple similarity check to avoid near-duplicates."""
-        # Basic word overlap similarity
+        # Basic word overlap similarity (store() uses the cached-token path)
         words1 = set(content1.lower().split())
         words2 = set(content2.lower().split())
-        if not words1 or not words2:
-            return False
-        overlap = len(words1 & words2) / max(len(words1), len(words2))
-        return overlap > threshold
+        return word_overlap(words1, words2) > threshold
 
     def get(self, memory_id: str) -> Optional[MemoryItem]:
         """Retrieve a memory item by ID."""
@@ -135,6 +293,7 @@ class LongTermMemory:
         if item:
             item.access_count += 1
             item.last_accessed = datetime.now()
+            self._revision += 1
         return item
 
     def query(
@@ -144,66 +303,212 @@ class LongTermMemory:
         status: Optional[MemoryStatus] = None,
         min_confidence: float = 0.0,
         max_age_hours: Optional[float] = None,
+        categories: Optional[Iterable[MemoryCategory]] = None,
     ) -> List[MemoryItem]:
-        """Query memories with filters."""
+        """
+        Query memories with filters.
+
+        categories matches any of several categories in the same single
+        pass over the store (combined with category if both are given).
+        """
+        now = datetime.now()
         results = []
-        for item in self._store.values():
-            if category and item.category != category:
-                continue
-            if scope and item.scope != scope:
+        for item in self._candidates(category, categories, status):
+            if scope and item.scope is not scope:
                 continue
-            if status and item.status != status:
+            if status and item.status is not status:
                 continue
             if item.confidence < min_confidence:
                 continue
-            if max_age_hours and item.age_hours > max_age_hours:
+            if max_age_hours and item.age_hours_at(now) > max_age_hours:
+                continue
+            results.append(item)
+        return results
+
+    def _candidates(
+        self,
+        category: Optional[MemoryCategory],
+        categories: Optional[Iterable[MemoryCategory]],
+        status: Optional[MemoryStatus] = None,
+    ) -> Iterable[MemoryItem]:
+        """
+        Items narrowed by the category and status indexes, in store order.
+
+        Callers still apply every filter; this only skips items that
+        cannot match.
+        """
+        store = self._store
+        status_ids = self._by_status.get(status, set()) if status else None
+        if not category and categories is None:
+            if status_ids is None:
+                return store.values()
+            return [store[memory_id] for memory_id in sorted(status_ids, key=self._seq.__getitem__)]
+        if category:
+            wanted = [category]
+            if categories is not None and category not in set(categories):
+                wanted = []
+        else:
+            wanted = list(dict.fromkeys(categories))
+        id_lists = [self._by_category[c] for c in wanted if c in self._by_category]
+        if len(id_lists) == 1:
+            ids: Iterable[str] = id_lists[0]
+        else:
+            ids = heapq.merge(*id_lists, key=self._seq.__getitem__)
+        if status_ids is not None:
+            return [store[memory_id] for memory_id in ids if memory_id in status_ids]
+        return [store[memory_id] for memory_id in ids]
+
+    def count_by_status(self, status: MemoryStatus) -> int:
+        """Number of stored items with the given status."""
+        return len(self._by_status.get(status, ()))
+
+    def query_by_terms(
+        self,
+        terms: Iterable[str],
+        category: Optional[MemoryCategory] = None,
+        status: Optional[MemoryStatus] = None,
+    ) -> List[MemoryItem]:
+        """
+        Return items sharing at least one index term (see types.index_terms),
+        filtered like query() and in store order.
+        """
+        ids: Set[str] = set()
+        for term in terms:
+            postings = self._term_index.get(term)
+            if postings:
+                ids |= postings
+        results = []
+        for memory_id in sorted(ids, key=self._seq.__getitem__):
+            item = self._store[memory_id]
+            if category and item.category is not category:
+                continue
+            if status and item.status is not status:
                 continue
             results.append(item)
         return results
 
+    def top_recent_active(self, n: int, min_confidence: float = 0.0) -> List[MemoryItem]:
+        """
+        Newest ACTIVE items with confidence >= min_confidence, at most n.
+
+        Same result as sorting query(status=ACTIVE, min_confidence=...) by
+        timestamp descending and taking n, but walks the time index from the
+        newest end and stops early. Status/confidence are checked live, so
+        in-place updates need no index maintenance.
+        """
+        results = []
+        for _, _, memory_id in reversed(self._by_time):
+            if len(results) >= n:
+                break
+            item = self._store[memory_id]
+            if item.status is MemoryStatus.ACTIVE and item.confidence >= min_confidence:
+                results.append(item)
+        return results
+
     def mark_contested(self, memory_id: str, reason: str) -> None:
         """Mark a memory as contested due to conflicting evidence."""
         item = self._store.get(memory_id)
         if item:
-            item.status = MemoryStatus.CONTESTED
+            self._set_status(item, MemoryStatus.CONTESTED)
             item.evidence_refs.append(f"contested: {reason}")
-            self._persist()
+            self._revision += 1
+            self._log_put(item)
 
     def supersede(self, old_id: str, new_item: MemoryItem) -> None:
         """Supersede an old memory with a new version."""
         old_item = self._store.get(old_id)
         if old_item:
-            old_item.status = MemoryStatus.SUPERSEDED
+            self._set_status(old_item, MemoryStatus.SUPERSEDED)
             new_item.supersedes = old_id
-            self._store[new_item.id] = new_item
-            self._persist()
+            self._insert(new_item)
+            self._revision += 1
+            self._log_put(old_item, new_item)
 
     def prune_expired(self) -> List[MemoryItem]:
         """Prune expired items, return them for archival."""
         expired = []
+        now = datetime.now()
         for item in list(self._store.values()):
-            if item.decay_factor < 0.25:  # Very decayed
-                item.status = MemoryStatus.EXPIRED
+            if item.decay_at(now) < 0.25:  # Very decayed
+                self._set_status(item, MemoryStatus.EXPIRED)
                 expired.append(item)
-                del self._store[item.id]
-        self._persist()
+                self._remove(item.id)
+        if expired:
+            self._revision += 1
+            self._log([{"op": "del", "id": item.id} for item in expired])
         return expired
 
+    def _log_put(self, *items: MemoryItem) -> None:
+        self._log([{"op": "put", "item": item.to_dict()} for item in items])
+
+    @contextmanager
+    def batch_update(self) -> Iterator["LongTermMemory"]:
+        """
+        Hold back write-ahead log appends for a batch of mutations.
+
+        Everything logged inside the block is appended in a single write on
+        exit instead of one file append per mutation. Nested blocks join
+        the outermost one.
+        """
+        if self._pending_ops is not None:
+            yield self
+            return
+        self._pending_ops = []
+        try:
+            yield self
+        finally:
+            ops, self._pending_ops = self._pending_ops, None
+            if ops:
+                self._log(ops)
+
+    def _log(self, ops: List[Dict[str, Any]]) -> None:
+        """Append mutations to the write-ahead log, compacting when it grows."""
+        if not self._wal_path:
+            return
+        if self._pending_ops is not None:
+            self._pending_ops.extend(ops)
+            return
+        self._wal_ops += _append_json_lines(self._wal_path, ops)
+        if self._wal_ops > max(2 * len(self._store), _WAL_COMPACT_MIN_OPS):
+            self.compact()
+
+    def compact(self) -> None:
+        """Write a full snapshot and truncate the write-ahead log."""
+        if not self._persist_path:
+            return
+        self._persist()
+        with open(self._wal_path, 'w'):
+            pass
+        self._wal_ops = 0
+
     def _persist(self) -> None:
-        """Persist to disk if path configured."""
+        """Persist a full snapshot to disk if path configured."""
         if self._persist_path:
             data = {k: v.to_dict() for k, v in self._store.items()}
-            with open(self._persist_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            tmp_path = f"{self._persist_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json_dumps(data, indent=True))
+            os.replace(tmp_path, self._persist_path)
 
     def _load(self) -> None:
-        """Load from disk."""
+        """Load the snapshot from disk, then replay the write-ahead log."""
         try:
-            with open(self._persist_path, 'r') as f:
-                data = json.load(f)
-            self._store = {k: MemoryItem.from_dict(v) for k, v in data.items()}
+            with open(self._persist_path, 'rb') as f:
+                data = json_loads(f.read())
+            for v in data.values():
+                self._insert(MemoryItem.from_dict(v))
         except (json.JSONDecodeError, FileNotFoundError):
             self._store = {}
+        self._replay_wal()
+
+    def _replay_wal(self) -> None:
+        """Apply logged mutations on top of the loaded snapshot."""
+        for op in _read_json_lines(self._wal_path):
+            if op["op"] == "put":
+                self._insert(MemoryItem.from_dict(op["item"]))
+            elif op["id"] in self._store:
+                self._remove(op["id"])
+            self._wal_ops += 1
 
 
 class EpisodicTraces:
@@ -217,64 +522,116 @@ class EpisodicTraces:
     def __init__(self, max_traces: int = 1000, persist_path: Optional[str] = None):
         self._traces: deque = deque(maxlen=max_traces)
         self._persist_path = persist_path
-        if persist_path and os.path.exists(persist_path):
+        # New traces are appended to <persist_path>.wal; the snapshot is
+        # rewritten only when the log outgrows the trace window
+        self._wal_path = f"{persist_path}.wal" if persist_path else None
+        self._wal_ops = 0
+        if persist_path and (os.path.exists(persist_path) or os.path.exists(self._wal_path)):
             self._load()
 
     def record(self, event_type: str, summary: str, metadata: Optional[Dict] = None) -> str:
         """Record a compressed event trace."""
-        import hashlib
-        trace_id = hashlib.sha256(
-            f"{event_type}{summary}{datetime.now().isoformat()}".encode()
-        ).hexdigest()[:8]
+        trace = self._make_trace(event_type, summary, metadata)
+        self._traces.append(trace)
+        self._log([trace])
+        return trace.trace_id
+
+    def record_batch(
+        self,
+        events: Iterable[Tuple[str, str, Optional[Dict]]],
+    ) -> List[str]:
+        """
+        Record several (event_type, summary, metadata) traces at once.
+
+        Persists once for the whole batch instead of once per event.
+        Returns the trace IDs in order.
+        """
+        traces = [
+            self._make_trace(event_type, summary, metadata)
+            for event_type, summary, metadata in events
+        ]
+        self._traces.extend(traces)
+        self._log(traces)
+        return [trace.trace_id for trace in traces]
+
+    def _make_trace(self, event_type: str, summary: str, metadata: Optional[Dict]) -> EpisodicTrace:
+        """Build a compressed trace with a content+time derived ID."""
+        trace_id = short_hash(f"{event_type}{summary}{datetime.now().isoformat()}", 8)
 
-        trace = EpisodicTrace(
+        return EpisodicTrace(
             trace_id=trace_id,
             event_type=event_type,
             summary=summary[:300],  # Compress
             metadata=metadata or {},
         )
-        self._traces.append(trace)
-        self._persist()
-        return trace_id
 
     def get_recent(self, n: int = 10, event_type: Optional[str] = None) -> List[EpisodicTrace]:
         """Get recent traces, optionally filtered by type."""
-        traces = list(self._traces)
+        if n <= 0:
+            # Keep the traces[-n:] slice semantics for non-positive n
+            traces = [t for t in self._traces if not event_type or t.event_type == event_type]
+            return traces[-n:]
+        # Walk newest-first and stop once n matches are found
+        newest = reversed(self._traces)
         if event_type:
-            traces = [t for t in traces if t.event_type == event_type]
-        return traces[-n:]
+            newest = (t for t in newest if t.event_type == event_type)
+        recent = list(islice(newest, n))
+        recent.reverse()
+        return recent
 
     def diagnose(self, keyword: str) -> List[EpisodicTrace]:
         """Search traces for diagnostic purposes."""
-        return [
-            t for t in self._traces
-            if keyword.lower() in t.summary.lower()
-        ]
+        keyword = keyword.lower()
+        return [t for t in self._traces if keyword in t.summary_lower]
+
+    def _log(self, traces: List[EpisodicTrace]) -> None:
+        """Append traces to the write-ahead log, compacting when it grows."""
+        if not self._wal_path:
+            return
+        self._wal_ops += _append_json_lines(self._wal_path, (t.to_dict() for t in traces))
+        if self._wal_ops > max(self._traces.maxlen or 0, _WAL_COMPACT_MIN_OPS):
+            self.compact()
+
+    def compact(self) -> None:
+        """Write a full snapshot and truncate the write-ahead log."""
+        if not self._persist_path:
+            return
+        self._persist()
+        with open(self._wal_path, 'w'):
+            pass
+        self._wal_ops = 0
 
     def _persist(self) -> None:
         if self._persist_path:
             data = [t.to_dict() for t in self._traces]
-            with open(self._persist_path, 'w') as f:
-                json.dump(data, f)
+            tmp_path = f"{self._persist_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json_dumps(data))
+            os.replace(tmp_path, self._persist_path)
+
+    @staticmethod
+    def _trace_from_dict(item: Dict[str, Any]) -> EpisodicTrace:
+        return EpisodicTrace(
+            trace_id=item["trace_id"],
+            event_type=item["event_type"],
+            summary=item["summary"],
+            timestamp=datetime.fromisoformat(item["timestamp"]),
+            metadata=item.get("metadata", {}),
+        )
 
     def _load(self) -> None:
         try:
-            with open(self._persist_path, 'r') as f:
-                data = json.load(f)
-            for item in data:
-                trace = EpisodicTrace(
-                    trace_id=item["trace_id"],
-                    event_type=item["event_type"],
-                    summary=item["summary"],
-                    timestamp=datetime.fromisoformat(item["timestamp"]),
-                    metadata=item.get("metadata", {}),
-                )
-                self._traces.append(trace)
+            with open(self._persist_path, 'rb') as f:
+                data = json_loads(f.read())
+            self._traces.extend([self._trace_from_dict(item) for item in data])
         except (json.JSONDecodeError, FileNotFoundError):
             pass
+        replayed = [self._trace_from_dict(item) for item in _read_json_lines(self._wal_path)]
+        self._traces.extend(replayed)
+        self._wal_ops += len(replayed)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ThreeTierMemory:
     """
     Unified three-tier memory system.
@@ -320,6 +677,6 @@ class ThreeTierMemory:
         """Get combined context for retrieval decisions."""
         return {
             "working": self.working.get_context_window(),
-            "active_memories": len(self.long_term.query(status=MemoryStatus.ACTIVE)),
+            "active_memories": self.long_term.count_by_status(MemoryStatus.ACTIVE),
             "recent_traces": len(self.episodic.get_recent(10)),
         }
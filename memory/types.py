@@ -3,8 +3,19 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, FrozenSet, AbstractSet, Set
 import hashlib
+import math
+import re
+import sys
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class MemoryScope(Enum):
@@ -33,6 +44,79 @@ class MemoryCategory(Enum):
     DECISION = "decision"         # Past decisions with rationale
 
 
+def short_hash(text: str, length: int) -> str:
+    """Non-cryptographic hex digest of text, truncated to length chars (ID use only)."""
+    data = text.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_128(data).hexdigest()[:length]
+    return hashlib.blake2b(data, digest_size=16).hexdigest()[:length]
+
+
+def word_overlap(words1: AbstractSet[str], words2: AbstractSet[str]) -> float:
+    """Word overlap similarity: |A & B| / max(|A|, |B|), 0.0 if either is empty."""
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / max(len(words1), len(words2))
+
+
+def token_signature(tokens: AbstractSet[str]) -> int:
+    """256-bit signature of a token set: bit (hash(token) & 255) per token."""
+    sig = 0
+    for token in tokens:
+        sig |= 1 << (hash(token) & 255)
+    return sig
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+popcount = getattr(int, "bit_count", _popcount)
+
+
+def overlap_exceeds(
+    words1: AbstractSet[str],
+    sig1: int,
+    words2: AbstractSet[str],
+    sig2: int,
+    threshold: float,
+) -> bool:
+    """
+    Exact test for word_overlap(words1, words2) > threshold.
+
+    Every bit set in sig1 but not sig2 comes from a distinct token of
+    words1 missing from words2, so popcount(sig1 & ~sig2) is a lower bound
+    on |words1 - words2| and gives an upper bound on the intersection.
+    Pairs whose bound is already <= threshold are rejected with a few
+    integer ops; only the rest pay for a set intersection.
+    """
+    n1 = len(words1)
+    n2 = len(words2)
+    if not n1 or not n2:
+        return False
+    limit = threshold * (n1 if n1 > n2 else n2)
+    bound = min(n1 - popcount(sig1 & ~sig2), n2 - popcount(sig2 & ~sig1))
+    if bound <= limit:
+        return False
+    return len(words1 & words2) > limit
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def index_terms(text_lower: str) -> Set[str]:
+    """
+    Inverted-index terms for lowercased text.
+
+    Whitespace tokens (what the overlap checks compare) plus \\w+ words
+    (what the numeric-conflict keys are), so any pair of texts that could
+    be compared as related shares at least one term.
+    """
+    terms = set(text_lower.split())
+    terms.update(_WORD_RE.findall(text_lower))
+    return terms
+
+
 # Half-life configurations (in hours)
 HALF_LIFE_CONFIG = {
     MemoryCategory.FACTUAL: 168,        # 7 days
@@ -43,7 +127,7 @@ HALF_LIFE_CONFIG = {
 }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MemoryItem:
     """
     A single memory item with metadata for decay and retrieval.
@@ -75,17 +159,51 @@ class MemoryItem:
     access_count: int = 0
     last_accessed: Optional[datetime] = None
     _id: Optional[str] = field(default=None, repr=False)
+    _tokens: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    _content_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _signature: Optional[int] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        # Sources come from a small vocabulary ("user_input", "tool:web_search",
+        # ...); interning shares one string per source across all items,
+        # including those loaded from disk
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
         if self._id is None:
             # Generate deterministic ID from content + timestamp
             hash_input = f"{self.content}{self.timestamp.isoformat()}"
-            self._id = hashlib.sha256(hash_input.encode()).hexdigest()[:12]
+            self._id = short_hash(hash_input, 12)
 
     @property
     def id(self) -> str:
         return self._id
 
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content (computed once, content is immutable)."""
+        if self._content_lower is None:
+            self._content_lower = self.content.lower()
+        return self._content_lower
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Lowercased word set of the content (computed once, content is immutable)."""
+        if self._tokens is None:
+            self._tokens = frozenset(self.content_lower.split())
+        return self._tokens
+
+    @property
+    def signature(self) -> int:
+        """token_signature of tokens (computed once)."""
+        if self._signature is None:
+            self._signature = token_signature(self.tokens)
+        return self._signature
+
+    @property
+    def approx_tokens(self) -> int:
+        """Rough token count (~4 characters per token), no tokenization needed."""
+        return max(1, len(self.content) // 4)
+
     @property
     def effective_half_life(self) -> float:
         """Get effective half-life in hours."""
@@ -96,8 +214,11 @@ class MemoryItem:
     @property
     def age_hours(self) -> float:
         """Age of the memory in hours."""
-        delta = datetime.now() - self.timestamp
-        return delta.total_seconds() / 3600
+        return self.age_hours_at(datetime.now())
+
+    def age_hours_at(self, now: datetime) -> float:
+        """Age in hours relative to now (lets batch callers share one clock read)."""
+        return (now - self.timestamp).total_seconds() / 3600
 
     @property
     def decay_factor(self) -> float:
@@ -105,9 +226,12 @@ class MemoryItem:
         Decay factor based on exponential decay: e^(-lambda * t)
         Returns value between 0 and 1.
         """
-        import math
+        return self.decay_at(datetime.now())
+
+    def decay_at(self, now: datetime) -> float:
+        """decay_factor relative to now."""
         lambda_decay = 0.693 / self.effective_half_life  # ln(2) / half_life
-        return math.exp(-lambda_decay * self.age_hours)
+        return math.exp(-lambda_decay * self.age_hours_at(now))
 
     @property
     def needs_verification(self) -> bool:
@@ -156,7 +280,7 @@ class MemoryItem:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EpisodicTrace:
     """
     Compressed event trace for debugging/replay.
@@ -167,6 +291,11 @@ class EpisodicTrace:
     summary: str     # Compressed summary, not raw content
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    summary_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Lowercased once for diagnose(); not serialized
+        self.summary_lower = self.summary.lower()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
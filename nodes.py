@@ -1,5 +1,6 @@
 """Node functions for the LangGraph research agent workflow."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from langchain_core.documents import Document
 
@@ -14,6 +15,7 @@ from graders import (
 from tools import (
     web_search,
     academic_search,
+    dedup_documents,
     format_documents_for_context,
     format_agent_responses
 )
@@ -103,11 +105,15 @@ def query_secondary_agents(state: ResearchState) -> ResearchState:
 
     agent_responses = state.get("agent_responses", {})
 
-    for domain in secondary_domains:
-        agent = AGENTS.get(domain)
-        if agent:
+    # Each agent keeps its own conversation history, so distinct agents can
+    # be queried concurrently; the LLM calls are network-bound.
+    agents = [AGENTS[d] for d in dict.fromkeys(secondary_domains) if AGENTS.get(d)]
+    if agents:
+        for agent in agents:
             print(f"  Querying {agent.name}...")
-            response = agent.chat(question)
+        with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+            responses = list(executor.map(lambda a: a.chat(question), agents))
+        for agent, response in zip(agents, responses):
             agent_responses[agent.name] = response
 
     return {
@@ -138,7 +144,10 @@ def synthesize_responses(state: ResearchState) -> ResearchState:
 
     return {
         **state,
-        "synthesis": synthesis.content if hasattr(synthesis, 'content') else str(synthesis)
+        "synthesis": synthesis.content if hasattr(synthesis, 'content') else str(synthesis),
+        # Reused by check_hallucination for the grounding sources
+        "formatted_documents": formatted_docs,
+        "formatted_agent_responses": formatted_responses,
     }
 
 
@@ -150,15 +159,19 @@ def web_search_node(state: ResearchState) -> ResearchState:
     question = state["question"]
     documents = state.get("documents", [])
 
-    # Perform academic search
+    # Perform academic search; retries re-run this node, so drop documents
+    # already collected by an earlier pass
     new_docs = academic_search(question, max_results=5)
-    documents.extend(new_docs)
+    documents = dedup_documents(documents + new_docs)
 
     print(f"  Found {len(new_docs)} documents")
 
     return {
         **state,
-        "documents": documents
+        "documents": documents,
+        # The synthesis-time formatting no longer matches the documents
+        "formatted_documents": "",
+        "formatted_agent_responses": "",
     }
 
 
@@ -171,10 +184,12 @@ def check_hallucination(state: ResearchState) -> ResearchState:
     documents = state.get("documents", [])
     agent_responses = state.get("agent_responses", {})
 
-    # Combine all sources for grounding check
-    all_sources = format_documents_for_context(documents)
+    # Combine all sources for grounding check (formatted once in synthesize_responses)
+    all_sources = state.get("formatted_documents") or format_documents_for_context(documents)
     if agent_responses:
-        all_sources += "\n\nAgent research:\n" + format_agent_responses(agent_responses)
+        all_sources += "\n\nAgent research:\n" + (
+            state.get("formatted_agent_responses") or format_agent_responses(agent_responses)
+        )
 
     # Grade hallucination
     result = hallucination_grader.invoke({
@@ -256,6 +271,8 @@ def refine_and_retry(state: ResearchState) -> ResearchState:
         "agent_responses": {},
         "documents": [],
         "synthesis": "",
+        "formatted_documents": "",
+        "formatted_agent_responses": "",
         "iteration_count": iteration_count + 1,
         "web_search_needed": True  # Force web search on retry
     }
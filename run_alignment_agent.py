@@ -19,14 +19,22 @@ Requirements:
 
 import os
 import argparse
+import asyncio
 from agents import (
     AlignmentAgent,
     SimpleAlignmentPipeline,
     quick_align_response,
-    generate_preference_dataset,
-    generate_sft_dataset,
-    dpo_loss_reference,
+    generate_preference_dataset_async,
+    generate_sft_dataset_async,
+    DPO_LOSS_REFERENCE,
 )
+from agents.llm_cache import enable_response_cache
+from agents.openai_client import run_with_async_client
+
+
+def _preview(text: str, limit: int = 500) -> str:
+    """First limit characters of text, with "..." appended if it was cut."""
+    return text[:limit] + ("..." if text[limit:limit + 1] else "")
 
 
 def demo_best_of_n():
@@ -40,9 +48,11 @@ def demo_best_of_n():
     prompt = "Explain what machine learning is to a 10-year-old."
 
     print(f"\nPrompt: {prompt}")
-    print("\nGenerating 4 responses and selecting the best...")
+    print("\nGenerating up to 4 responses and selecting the best...")
 
-    best_response, all_responses = pipeline.best_of_n_sampling(prompt, n=4)
+    best_response, all_responses = run_with_async_client(
+        pipeline.best_of_n_async(prompt, n=4, early_stop_score=9)
+    )
 
     print(f"\nGenerated {len(all_responses)} responses")
     print("\n--- Best Response ---")
@@ -65,10 +75,10 @@ def demo_preference_generation():
     pair = pipeline.generate_preference_pair(prompt)
 
     print("\n--- CHOSEN (Improved) Response ---")
-    print(pair.chosen[:500] + "..." if len(pair.chosen) > 500 else pair.chosen)
+    print(_preview(pair.chosen))
 
     print("\n--- REJECTED (Original) Response ---")
-    print(pair.rejected[:500] + "..." if len(pair.rejected) > 500 else pair.rejected)
+    print(_preview(pair.rejected))
 
 
 def demo_sft_data():
@@ -86,7 +96,7 @@ def demo_sft_data():
     print("(Using best-of-3 to get high-quality responses)")
 
     pipeline = SimpleAlignmentPipeline()
-    dataset = pipeline.create_sft_dataset(prompts)
+    dataset = run_with_async_client(pipeline.create_sft_dataset_async(prompts))
 
     for i, item in enumerate(dataset):
         print(f"\n--- Example {i+1} ---")
@@ -104,7 +114,7 @@ def demo_dpo_loss():
     print("L_DPO = -log(sigmoid(beta * (log(pi(y_w|x)/pi_ref(y_w|x)) - log(pi(y_l|x)/pi_ref(y_l|x)))))")
 
     print("\nPyTorch implementation:")
-    print(dpo_loss_reference())
+    print(DPO_LOSS_REFERENCE)
 
 
 def interactive_mode():
@@ -116,6 +126,7 @@ def interactive_mode():
     print("Commands: 'explain dpo', 'explain sft', 'quit'\n")
 
     agent = AlignmentAgent()
+    explainers = {'explain dpo': agent.explain_dpo, 'explain sft': agent.explain_sft}
 
     while True:
         try:
@@ -124,18 +135,15 @@ def interactive_mode():
             if not query:
                 continue
 
-            if query.lower() == 'quit':
+            command = query.lower()
+            if command == 'quit':
                 print("Goodbye!")
                 break
 
-            if query.lower() == 'explain dpo':
+            explain = explainers.get(command)
+            if explain is not None:
                 print("\nAlignment Agent: ", end="")
-                print(agent.explain_dpo())
-                continue
-
-            if query.lower() == 'explain sft':
-                print("\nAlignment Agent: ", end="")
-                print(agent.explain_sft())
+                print(explain())
                 continue
 
             response = agent.chat(query)
@@ -163,26 +171,30 @@ def generate_data_mode():
 
     print(f"\nGenerating alignment data for {len(sample_prompts)} prompts...")
 
-    # Generate DPO preference data
+    # Generate DPO preference data and SFT data concurrently
     print("\n1. Generating DPO preference data...")
-    dpo_dataset = generate_preference_dataset(
-        sample_prompts,
-        output_file="alignment_data/dpo_preferences.json",
-        method="constitutional"
-    )
-
-    # Generate SFT data
     print("\n2. Generating SFT data...")
-    sft_dataset = generate_sft_dataset(
-        sample_prompts,
-        output_file="alignment_data/sft_data.json"
-    )
+
+    async def generate_both():
+        return await asyncio.gather(
+            generate_preference_dataset_async(
+                sample_prompts,
+                output_file="alignment_data/dpo_preferences.jsonl",
+                method="constitutional"
+            ),
+            generate_sft_dataset_async(
+                sample_prompts,
+                output_file="alignment_data/sft_data.jsonl"
+            ),
+        )
+
+    dpo_dataset, sft_dataset = run_with_async_client(generate_both())
 
     print("\n" + "="*60)
     print("DATA GENERATION COMPLETE")
     print("="*60)
-    print(f"\nDPO data: alignment_data/dpo_preferences.json ({len(dpo_dataset.pairs)} pairs)")
-    print(f"SFT data: alignment_data/sft_data.json ({len(sft_dataset)} examples)")
+    print(f"\nDPO data: alignment_data/dpo_preferences.jsonl ({len(dpo_dataset.pairs)} pairs)")
+    print(f"SFT data: alignment_data/sft_data.jsonl ({len(sft_dataset)} examples)")
 
 
 def main():
@@ -193,8 +205,16 @@ def main():
         default="demo",
         help="Mode to run (default: demo)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the API instead of reusing cached responses"
+    )
     args = parser.parse_args()
 
+    if not args.no_cache:
+        enable_response_cache()
+
     # Check API key
     if not os.getenv("OPENAI_API_KEY"):
         print("Error: OPENAI_API_KEY environment variable not set")
@@ -18,6 +18,7 @@ Usage:
 import os
 import sys
 import argparse
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -29,6 +30,7 @@ from agents import (
     create_psychology_research_agent,
     create_statistics_research_agent,
 )
+from agents.streaming import flushing_writer
 from memory import MemoryCategory
 
 
@@ -46,20 +48,23 @@ def print_header(agent: UnifiedResearchAgent):
     print()
 
 
+COMMANDS_HELP = """Commands:
+  /stats      - Show citation statistics
+  /authors    - List tracked authors with h-index
+  /papers     - List tracked papers by citations
+  /search     - Search citation database
+  /memory     - Show memory summary
+  /health     - Show system health
+  /summary    - Full research summary
+  /clear      - Clear conversation history
+  /help       - Show this help
+  /quit       - Exit
+"""
+
+
 def print_commands():
     """Print available commands."""
-    print("Commands:")
-    print("  /stats      - Show citation statistics")
-    print("  /authors    - List tracked authors with h-index")
-    print("  /papers     - List tracked papers by citations")
-    print("  /search     - Search citation database")
-    print("  /memory     - Show memory summary")
-    print("  /health     - Show system health")
-    print("  /summary    - Full research summary")
-    print("  /clear      - Clear conversation history")
-    print("  /help       - Show this help")
-    print("  /quit       - Exit")
-    print()
+    print(COMMANDS_HELP)
 
 
 def run_demo(agent: UnifiedResearchAgent):
@@ -129,8 +134,8 @@ def run_demo(agent: UnifiedResearchAgent):
         },
     ]
 
+    agent.citation_agent.record_papers_bulk(papers)
     for p in papers:
-        agent.citation_agent.record_paper(**p)
         print(f"   Recorded: {p['title'][:50]}... ({p['citations']:,} citations)")
 
     # 2. Show author statistics
@@ -196,6 +201,7 @@ def run_demo(agent: UnifiedResearchAgent):
 
 def show_citation_stats(agent: UnifiedResearchAgent):
     """Show citation statistics."""
+    # Cached on the graph version, so consecutive commands share one snapshot
     stats = agent.citation_agent.graph.get_statistics()
     print("\n=== Citation Statistics ===")
     print(f"Total Papers: {stats.get('total_papers', 0)}")
@@ -244,64 +250,74 @@ def search_database(agent: UnifiedResearchAgent):
         print("  No papers found matching query.")
 
 
+def show_memory(agent: UnifiedResearchAgent):
+    """Show memory summary."""
+    if agent.memory_enabled:
+        print("\n" + agent.get_memory_summary())
+    else:
+        print("  Memory not enabled.")
+
+
+def show_health(agent: UnifiedResearchAgent):
+    """Show system health."""
+    print("\nSystem Health:")
+    print(agent.format_memory_health())
+
+
+def show_summary(agent: UnifiedResearchAgent):
+    """Show the full research summary."""
+    print("\n" + agent.get_research_summary())
+
+
+def clear_history(agent: UnifiedResearchAgent):
+    """Clear conversation history."""
+    agent.clear_history()
+    print("  Conversation history cleared.")
+
+
+QUIT_COMMANDS = {"/quit", "/exit"}
+
+COMMANDS = {
+    "/help": lambda agent: print_commands(),
+    "/stats": show_citation_stats,
+    "/authors": show_authors,
+    "/papers": show_papers,
+    "/search": search_database,
+    "/memory": show_memory,
+    "/health": show_health,
+    "/summary": show_summary,
+    "/clear": clear_history,
+}
+
+
 def interactive_chat(agent: UnifiedResearchAgent):
     """Run interactive chat session."""
     print_commands()
+    # Refreshes the citation stats snapshot while the user is typing; joined
+    # before the next command so it never races a graph mutation.
+    warmup = None
 
     while True:
         try:
             user_input = input("\nYou: ").strip()
+            if warmup is not None:
+                warmup.join()
+                warmup = None
 
             if not user_input:
                 continue
 
             # Handle commands
             if user_input.startswith("/"):
-                cmd = user_input.lower().split()[0]
+                cmd = user_input.split(maxsplit=1)[0].lower()
 
-                if cmd == "/quit" or cmd == "/exit":
+                if cmd in QUIT_COMMANDS:
                     print("\nGoodbye!")
                     break
 
-                elif cmd == "/help":
-                    print_commands()
-
-                elif cmd == "/stats":
-                    show_citation_stats(agent)
-
-                elif cmd == "/authors":
-                    show_authors(agent)
-
-                elif cmd == "/papers":
-                    show_papers(agent)
-
-                elif cmd == "/search":
-                    search_database(agent)
-
-                elif cmd == "/memory":
-                    if agent.memory_enabled:
-                        print("\n" + agent.get_memory_summary())
-                    else:
-                        print("  Memory not enabled.")
-
-                elif cmd == "/health":
-                    print("\nSystem Health:")
-                    health = agent.get_memory_health()
-                    for key, value in health.items():
-                        if isinstance(value, dict):
-                            print(f"  {key}:")
-                            for k, v in value.items():
-                                print(f"    {k}: {v}")
-                        else:
-                            print(f"  {key}: {value}")
-
-                elif cmd == "/summary":
-                    print("\n" + agent.get_research_summary())
-
-                elif cmd == "/clear":
-                    agent.clear_history()
-                    print("  Conversation history cleared.")
-
+                handler = COMMANDS.get(cmd)
+                if handler is not None:
+                    handler(agent)
                 else:
                     print(f"  Unknown command: {cmd}")
                     print("  Type /help for available commands.")
@@ -310,8 +326,12 @@ def interactive_chat(agent: UnifiedResearchAgent):
                 # Regular chat
                 print("\nAgent: ", end="", flush=True)
                 try:
-                    response = agent.chat(user_input)
-                    print(response)
+                    agent.chat(user_input, on_text=flushing_writer())
+                    print(flush=True)
+                    warmup = threading.Thread(
+                        target=agent.citation_agent.graph.get_statistics, daemon=True
+                    )
+                    warmup.start()
                 except Exception as e:
                     print(f"\n[Error: {e}]")
                     print("(Make sure OPENAI_API_KEY is set in .env)")
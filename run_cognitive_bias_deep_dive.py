@@ -2,24 +2,24 @@
 """Deep Dive: Quantitative Analysis of Cognitive Biases in Purchasing Behavior"""
 
 import os
+import sys
+from string import Template
 from dotenv import load_dotenv
 load_dotenv()
 
 from agents import PsychologyAgent, StatisticsAgent, ProductManagerAgent
+from agents.llm_cache import enable_response_cache
+from agents.streaming import StreamedResponse
 
-psychology = PsychologyAgent()
-stats = StatisticsAgent()
-pm = ProductManagerAgent()
+# Re-runs reuse cached completions; pass --no-cache to hit the API every time.
+if '--no-cache' not in sys.argv[1:]:
+    enable_response_cache()
 
-print('=' * 70)
-print('DEEP DIVE: Cognitive/Behavioral Biases in Purchasing Intentions')
-print('=' * 70)
 
-# Step 1: Psychology Agent - Quantitative Research on Biases
-print()
-print('>>> STEP 1: PSYCHOLOGY AGENT (Quantitative Bias Research)')
-print('-' * 70)
-psych_query = '''Provide a QUANTITATIVE deep dive on cognitive and behavioral biases affecting online purchasing intentions. For each bias, include:
+# Prompt bodies; the downstream ones quote a prefix of the upstream answers.
+# The quoted answers go last so the fixed instructions form a byte-identical
+# prefix across runs, which the API's automatic prompt caching can reuse.
+PSYCH_QUERY = '''Provide a QUANTITATIVE deep dive on cognitive and behavioral biases affecting online purchasing intentions. For each bias, include:
 
 1. **ANCHORING BIAS**
    - Effect sizes from empirical studies (Cohen's d, percentage changes)
@@ -72,17 +72,7 @@ For each bias, provide:
 - Confidence intervals where available
 - Replication status and meta-analysis findings'''
 
-psych_response = psychology.chat(psych_query)
-print(psych_response)
-
-# Step 2: Statistics Agent - Measurement Methodologies
-print()
-print('>>> STEP 2: STATISTICS AGENT (Measurement & Analysis Methods)')
-print('-' * 70)
-stats_query = f'''Based on the cognitive bias research:
-{psych_response[:3000]}
-
-Provide QUANTITATIVE methodologies for measuring these biases in e-commerce:
+STATS_QUERY = Template('''Provide QUANTITATIVE methodologies for measuring the cognitive biases in the research below in e-commerce:
 
 1. **EXPERIMENTAL DESIGN FOR BIAS MEASUREMENT**
    - Within-subject vs between-subject designs
@@ -119,24 +109,12 @@ Provide QUANTITATIVE methodologies for measuring these biases in e-commerce:
    - Heterogeneity assessment (I², Q statistic)
    - Publication bias detection (funnel plots, Egger's test)
    - Random-effects vs fixed-effects models
-   - Moderator analysis for context effects'''
+   - Moderator analysis for context effects
 
-stats_response = stats.chat(stats_query)
-print(stats_response)
+COGNITIVE BIAS RESEARCH:
+$psych''')
 
-# Step 3: Product Manager - Quantified Feature Impact
-print()
-print('>>> STEP 3: PRODUCT MANAGER (Quantified Feature Recommendations)')
-print('-' * 70)
-pm_query = f'''Based on the quantitative bias research and statistical methodologies:
-
-PSYCHOLOGY RESEARCH:
-{psych_response[:2500]}
-
-STATISTICAL METHODS:
-{stats_response[:2000]}
-
-Create a QUANTIFIED feature recommendation framework:
+PM_QUERY = Template('''Based on the quantitative bias research and statistical methodologies below, create a QUANTIFIED feature recommendation framework:
 
 1. **BIAS-TO-FEATURE MAPPING WITH EXPECTED LIFTS**
    - For each cognitive bias, specify:
@@ -169,28 +147,79 @@ Create a QUANTIFIED feature recommendation framework:
 6. **ETHICAL BOUNDARIES**
    - At what effect size does a nudge become manipulation?
    - Thresholds for acceptable influence
-   - Transparency requirements'''
+   - Transparency requirements
+
+PSYCHOLOGY RESEARCH:
+$psych
 
-pm_response = pm.chat(pm_query)
-print(pm_response)
+STATISTICAL METHODS:
+$stats''')
+
+
+psychology = PsychologyAgent()
+stats = StatisticsAgent()
+pm = ProductManagerAgent()
 
-print()
 print('=' * 70)
-print('COGNITIVE BIAS DEEP DIVE COMPLETE')
+print('DEEP DIVE: Cognitive/Behavioral Biases in Purchasing Intentions')
 print('=' * 70)
 
-# Save outputs
+# Step 1: Psychology Agent - Quantitative Research on Biases
+print()
+print('>>> STEP 1: PSYCHOLOGY AGENT (Quantitative Bias Research)')
+print('-' * 70)
+# Each step starts as soon as the slice it quotes from the previous step has
+# streamed in, overlapping with the tail of the upstream generation.
+psych_stream = StreamedResponse(psychology, PSYCH_QUERY)
+
+# Step 2: Statistics Agent - Measurement Methodologies
+stats_query = STATS_QUERY.substitute(psych=psych_stream.excerpt(3000))
+
+stats_stream = StreamedResponse(stats, stats_query)
+
+# Step 3: Product Manager - Quantified Feature Impact
+pm_query = PM_QUERY.substitute(
+    psych=psych_stream.excerpt(2500),
+    stats=stats_stream.excerpt(2000),
+)
+
+pm_stream = StreamedResponse(pm, pm_query)
+
+# Each section is saved as soon as its agent finishes, while the downstream
+# agents are still generating.
 with open('docs/cognitive_bias_deep_dive.txt', 'w') as f:
     f.write("COGNITIVE BIAS QUANTITATIVE DEEP DIVE\n")
     f.write("=" * 60 + "\n\n")
+
+    psych_response = psych_stream.result()
+    print(psych_response)
     f.write("PSYCHOLOGY AGENT - Quantitative Bias Research:\n")
     f.write("-" * 50 + "\n")
     f.write(psych_response + "\n\n")
+    f.flush()
+
+    print()
+    print('>>> STEP 2: STATISTICS AGENT (Measurement & Analysis Methods)')
+    print('-' * 70)
+    stats_response = stats_stream.result()
+    print(stats_response)
     f.write("STATISTICS AGENT - Measurement Methodologies:\n")
     f.write("-" * 50 + "\n")
     f.write(stats_response + "\n\n")
+    f.flush()
+
+    print()
+    print('>>> STEP 3: PRODUCT MANAGER (Quantified Feature Recommendations)')
+    print('-' * 70)
+    pm_response = pm_stream.result()
+    print(pm_response)
     f.write("PRODUCT MANAGER - Quantified Recommendations:\n")
     f.write("-" * 50 + "\n")
     f.write(pm_response + "\n")
 
+print()
+print('=' * 70)
+print('COGNITIVE BIAS DEEP DIVE COMPLETE')
+print('=' * 70)
+
 print("\n✓ Output saved to: docs/cognitive_bias_deep_dive.txt")
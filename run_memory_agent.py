@@ -53,24 +53,14 @@ def run_demo(agent: MemoryEnhancedAgent):
 
     # 1. Store some initial memories
     print("\n1. Storing factual memories...")
-    agent.remember(
-        "Anchoring bias has effect size d=0.3-0.5 in pricing studies",
-        MemoryCategory.FACTUAL,
-        "demo:cognitive_bias_research",
-        confidence=0.9
-    )
-    agent.remember(
-        "Social proof increases conversion by 10-15% on average",
-        MemoryCategory.FACTUAL,
-        "demo:social_proof_meta_analysis",
-        confidence=0.85
-    )
-    agent.remember(
-        "Loss aversion coefficient lambda typically 2.0-2.5",
-        MemoryCategory.FACTUAL,
-        "demo:kahneman_tversky",
-        confidence=0.95
-    )
+    agent.remember_many([
+        ("Anchoring bias has effect size d=0.3-0.5 in pricing studies",
+         MemoryCategory.FACTUAL, "demo:cognitive_bias_research", 0.9),
+        ("Social proof increases conversion by 10-15% on average",
+         MemoryCategory.FACTUAL, "demo:social_proof_meta_analysis", 0.85),
+        ("Loss aversion coefficient lambda typically 2.0-2.5",
+         MemoryCategory.FACTUAL, "demo:kahneman_tversky", 0.95),
+    ])
     print("   Stored 3 factual memories")
 
     # 2. Set up agent state
@@ -104,8 +94,8 @@ def run_demo(agent: MemoryEnhancedAgent):
     # 5. Demonstrate recall
     print("\n5. Recalling memories about 'bias effect'...")
     memories = agent.recall("bias effect sizes", RetrievalIntent.FACTUAL_QA)
-    for i, mem in enumerate(memories, 1):
-        print(f"   [{i}] {mem[:70]}...")
+    if memories:
+        print("\n".join(f"   [{i}] {mem[:70]}..." for i, mem in enumerate(memories, 1)))
 
     # 6. Show health status
     print("\n6. Memory Health Status:")
@@ -133,6 +123,68 @@ def run_demo(agent: MemoryEnhancedAgent):
     print("You can now chat with the agent. Type /help for commands.\n")
 
 
+def show_memory(agent: MemoryEnhancedAgent):
+    """Show memory summary."""
+    print("\n" + agent.get_memory_summary())
+
+
+def show_health(agent: MemoryEnhancedAgent):
+    """Show memory health status."""
+    print("\nMemory Health:")
+    print(agent.format_memory_health())
+
+
+def recall_memories(agent: MemoryEnhancedAgent):
+    """Prompt for a query and show the memories it recalls."""
+    query = input("  Recall query: ").strip()
+    if not query:
+        return
+
+    memories = agent.recall(query, RetrievalIntent.FACTUAL_QA, max_items=5)
+    if memories:
+        print("\n  Recalled memories:")
+        print("\n".join(
+            f"    [{i}] {mem[:80]}..." for i, mem in enumerate(memories, 1)
+        ))
+    else:
+        print("  No relevant memories found.")
+
+
+def show_decisions(agent: MemoryEnhancedAgent):
+    """Show recent decisions."""
+    decisions = agent.memory.get_decisions()
+    if decisions:
+        print("\n  Recent Decisions:")
+        for d in decisions[-5:]:
+            print(f"    - {d['decision'][:60]}...")
+    else:
+        print("  No decisions recorded yet.")
+
+
+def show_state(agent: MemoryEnhancedAgent):
+    """Show agent state."""
+    print("\n" + agent.memory.get_state_summary())
+
+
+def clear_history(agent: MemoryEnhancedAgent):
+    """Clear conversation history."""
+    agent.clear_history()
+    print("  Conversation history cleared.")
+
+
+QUIT_COMMANDS = {"/quit", "/exit"}
+
+COMMANDS = {
+    "/help": lambda agent: print_commands(),
+    "/memory": show_memory,
+    "/health": show_health,
+    "/recall": recall_memories,
+    "/decisions": show_decisions,
+    "/state": show_state,
+    "/clear": clear_history,
+}
+
+
 def interactive_chat(agent: MemoryEnhancedAgent):
     """Run interactive chat session."""
     print_commands()
@@ -146,56 +198,15 @@ def interactive_chat(agent: MemoryEnhancedAgent):
 
             # Handle commands
             if user_input.startswith("/"):
-                cmd = user_input.lower().split()[0]
+                cmd = user_input.split(maxsplit=1)[0].lower()
 
-                if cmd == "/quit" or cmd == "/exit":
+                if cmd in QUIT_COMMANDS:
                     print("\nGoodbye!")
                     break
 
-                elif cmd == "/help":
-                    print_commands()
-
-                elif cmd == "/memory":
-                    print("\n" + agent.get_memory_summary())
-
-                elif cmd == "/health":
-                    print("\nMemory Health:")
-                    health = agent.get_memory_health()
-                    for key, value in health.items():
-                        if isinstance(value, dict):
-                            print(f"  {key}:")
-                            for k, v in value.items():
-                                print(f"    {k}: {v}")
-                        else:
-                            print(f"  {key}: {value}")
-
-                elif cmd == "/recall":
-                    query = input("  Recall query: ").strip()
-                    if query:
-                        memories = agent.recall(query, RetrievalIntent.FACTUAL_QA, max_items=5)
-                        if memories:
-                            print("\n  Recalled memories:")
-                            for i, mem in enumerate(memories, 1):
-                                print(f"    [{i}] {mem[:80]}...")
-                        else:
-                            print("  No relevant memories found.")
-
-                elif cmd == "/decisions":
-                    decisions = agent.memory.get_decisions()
-                    if decisions:
-                        print("\n  Recent Decisions:")
-                        for d in decisions[-5:]:
-                            print(f"    - {d['decision'][:60]}...")
-                    else:
-                        print("  No decisions recorded yet.")
-
-                elif cmd == "/state":
-                    print("\n" + agent.memory.get_state_summary())
-
-                elif cmd == "/clear":
-                    agent.clear_history()
-                    print("  Conversation history cleared.")
-
+                handler = COMMANDS.get(cmd)
+                if handler is not None:
+                    handler(agent)
                 else:
                     print(f"  Unknown command: {cmd}")
                     print("  Type /help for available commands.")
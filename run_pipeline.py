@@ -2,12 +2,45 @@
 """Run full pipeline: Psychiatry → Applications → Product Manager"""
 
 import os
+import sys
+from string import Template
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 from agents import PsychiatryAgent, ApplicationsAgent, ProductManagerAgent
+from agents.llm_cache import enable_response_cache
+from agents.streaming import BatchedResponse, StreamedResponse
+
+# Re-runs reuse cached completions; pass --no-cache to hit the API every time.
+if '--no-cache' not in sys.argv[1:]:
+    enable_response_cache()
+
+# --batch runs each stage through the Batch API: half the cost, but each
+# stage may wait up to 24h and answers without web search.
+Stage = BatchedResponse if '--batch' in sys.argv[1:] else StreamedResponse
+
+# Downstream prompts end with the quoted upstream answers, so their fixed
+# instructions stay a stable, cacheable prefix from run to run.
+APPS_QUERY = Template('''How are the principles in the psychiatry research below currently applied in real e-commerce platforms?
+What are successful case studies and implementations?
+
+PSYCHIATRY RESEARCH INSIGHTS:
+$psych''')
+
+PM_QUERY = Template('''Based on the psychiatry research and industry applications below, synthesize them into actionable product recommendations:
+1. Define specific user personas
+2. Prioritize 3-5 MVP features
+3. Define success metrics for each
+4. Outline implementation phases
+5. Address ethical considerations
+
+PSYCHIATRY INSIGHTS:
+$psych
+
+INDUSTRY APPLICATIONS:
+$apps''')
 
 # Initialize all three agents
 psychiatry = PsychiatryAgent()
@@ -20,42 +53,35 @@ print('=' * 70)
 print('FULL PIPELINE: Psychiatry → Applications → Product Manager')
 print('=' * 70)
 
-# Step 1: Psychiatry Agent - Clinical/Research Foundation
+# Each stage starts as soon as the slices it quotes from earlier stages have
+# streamed in, so the LLM calls overlap instead of running back to back.
+psych_stream = Stage(psychiatry, query)
+
+# Step 2: Applications Agent - Real-world implementations
+apps_stream = Stage(applications, APPS_QUERY.substitute(psych=psych_stream.excerpt(2000)))
+
+# Step 3: Product Manager Agent - Product Strategy
+pm_stream = Stage(pm, PM_QUERY.substitute(
+    psych=psych_stream.excerpt(1500),
+    apps=apps_stream.excerpt(1500),
+))
+
 print()
 print('>>> STEP 1: PSYCHIATRY AGENT (Clinical Research Foundation)')
 print('-' * 70)
-psych_response = psychiatry.chat(query)
+psych_response = psych_stream.result()
 print(psych_response)
 
-# Step 2: Applications Agent - Real-world implementations
 print()
 print('>>> STEP 2: APPLICATIONS AGENT (Industry Use Cases)')
 print('-' * 70)
-apps_response = applications.chat(f'''Based on these psychiatry research insights:
-{psych_response[:2000]}
-
-How are these principles currently applied in real e-commerce platforms?
-What are successful case studies and implementations?''')
+apps_response = apps_stream.result()
 print(apps_response)
 
-# Step 3: Product Manager Agent - Product Strategy
 print()
 print('>>> STEP 3: PRODUCT MANAGER AGENT (Product Strategy)')
 print('-' * 70)
-pm_response = pm.chat(f'''Based on the psychiatry research and industry applications:
-
-PSYCHIATRY INSIGHTS:
-{psych_response[:1500]}
-
-INDUSTRY APPLICATIONS:
-{apps_response[:1500]}
-
-Now synthesize this into actionable product recommendations:
-1. Define specific user personas
-2. Prioritize 3-5 MVP features
-3. Define success metrics for each
-4. Outline implementation phases
-5. Address ethical considerations''')
+pm_response = pm_stream.result()
 print(pm_response)
 
 print()
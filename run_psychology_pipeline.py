@@ -2,26 +2,27 @@
 """Run full pipeline: Psychology Research → E-commerce Applications"""
 
 import os
+import sys
+from string import Template
 from dotenv import load_dotenv
 load_dotenv()
 
 from agents import PsychologyAgent, ApplicationsAgent, ProductManagerAgent, StatisticsAgent
+from agents.llm_cache import enable_response_cache
+from agents.streaming import BatchedResponse, StreamedResponse
 
-# Initialize agents
-psychology = PsychologyAgent()
-applications = ApplicationsAgent()
-pm = ProductManagerAgent()
-stats = StatisticsAgent()
+# Re-runs reuse cached completions; pass --no-cache to hit the API every time.
+if '--no-cache' not in sys.argv[1:]:
+    enable_response_cache()
 
-print('=' * 70)
-print('FULL PIPELINE: Psychology Methodologies → E-commerce Applications')
-print('=' * 70)
+# --batch runs each stage through the Batch API: half the cost, but each
+# stage may wait up to 24h and answers without web search.
+Stage = BatchedResponse if '--batch' in sys.argv[1:] else StreamedResponse
 
-# Step 1: Psychology Agent - Research Foundation
-print()
-print('>>> STEP 1: PSYCHOLOGY AGENT (Research Methodologies)')
-print('-' * 70)
-psych_query = '''Explore key psychological research methodologies and theories that can be applied to e-commerce platforms:
+# Prompt bodies. Later stages quote the start of earlier answers; those
+# quotes sit at the end so every run sends the same fixed instructions first,
+# a prefix the API's automatic prompt caching can reuse.
+PSYCH_QUERY = '''Explore key psychological research methodologies and theories that can be applied to e-commerce platforms:
 
 1. **Behavioral Psychology Methods**
    - Classical and operant conditioning in user behavior
@@ -53,40 +54,18 @@ For each area, provide:
 - Core methodologies used
 - Potential e-commerce applications'''
 
-psych_response = psychology.chat(psych_query)
-print(psych_response)
-
-# Step 2: Applications Agent - Real-world implementations
-print()
-print('>>> STEP 2: APPLICATIONS AGENT (Industry Use Cases)')
-print('-' * 70)
-apps_query = f'''Based on these psychology research insights:
-{psych_response[:3000]}
-
-How are these psychological methodologies currently applied in real e-commerce platforms?
+APPS_QUERY = Template('''How are the psychological methodologies in the research below currently applied in real e-commerce platforms?
 
 Provide:
 1. Specific company examples (Amazon, Netflix, Booking.com, etc.)
 2. Feature implementations based on psychology research
 3. Measured outcomes and success metrics
-4. Case studies of psychology-driven A/B tests'''
-
-apps_response = applications.chat(apps_query)
-print(apps_response)
-
-# Step 3: Product Manager Agent - Product Strategy
-print()
-print('>>> STEP 3: PRODUCT MANAGER AGENT (Product Strategy)')
-print('-' * 70)
-pm_query = f'''Based on the psychology research and industry applications:
+4. Case studies of psychology-driven A/B tests
 
-PSYCHOLOGY RESEARCH:
-{psych_response[:2000]}
+PSYCHOLOGY RESEARCH INSIGHTS:
+$psych''')
 
-INDUSTRY APPLICATIONS:
-{apps_response[:2000]}
-
-Create a comprehensive product strategy for implementing psychology-based features in an e-commerce platform:
+PM_QUERY = Template('''Based on the psychology research and industry applications below, create a comprehensive product strategy for implementing psychology-based features in an e-commerce platform:
 
 1. **Problem Statement** - What user problems do these methodologies solve?
 
@@ -102,19 +81,15 @@ Create a comprehensive product strategy for implementing psychology-based featur
 
 5. **Ethical Framework** - Guidelines for responsible implementation
 
-6. **Go-to-Market Considerations** - How to position psychology-driven features'''
+6. **Go-to-Market Considerations** - How to position psychology-driven features
 
-pm_response = pm.chat(pm_query)
-print(pm_response)
+PSYCHOLOGY RESEARCH:
+$psych
 
-# Step 4: Statistics Agent - A/B Testing Framework
-print()
-print('>>> STEP 4: STATISTICS AGENT (Experimentation Framework)')
-print('-' * 70)
-stats_query = f'''Design an A/B testing framework for psychology-based e-commerce features:
+INDUSTRY APPLICATIONS:
+$apps''')
 
-FEATURES TO TEST:
-{pm_response[:1500]}
+STATS_QUERY = Template('''Design an A/B testing framework for the psychology-based e-commerce features below.
 
 Provide:
 1. **Experiment Design** for each feature type:
@@ -135,9 +110,67 @@ Provide:
 4. **Segmentation Strategy**:
    - By psychological profile
    - By customer lifecycle stage
-   - By product category'''
+   - By product category
 
-stats_response = stats.chat(stats_query)
+FEATURES TO TEST:
+$features''')
+
+# Initialize agents
+psychology = PsychologyAgent()
+applications = ApplicationsAgent()
+pm = ProductManagerAgent()
+stats = StatisticsAgent()
+
+print('=' * 70)
+print('FULL PIPELINE: Psychology Methodologies → E-commerce Applications')
+print('=' * 70)
+
+# Each stage starts as soon as the slices it quotes from earlier stages have
+# streamed in, so the LLM calls overlap instead of running back to back.
+
+# Step 1: Psychology Agent - Research Foundation
+psych_stream = Stage(psychology, PSYCH_QUERY)
+
+# Step 2: Applications Agent - Real-world implementations
+apps_query = APPS_QUERY.substitute(psych=psych_stream.excerpt(3000))
+
+apps_stream = Stage(applications, apps_query)
+
+# Step 3: Product Manager Agent - Product Strategy
+pm_query = PM_QUERY.substitute(
+    psych=psych_stream.excerpt(2000),
+    apps=apps_stream.excerpt(2000),
+)
+
+pm_stream = Stage(pm, pm_query)
+
+# Step 4: Statistics Agent - A/B Testing Framework
+stats_query = STATS_QUERY.substitute(features=pm_stream.excerpt(1500))
+
+stats_stream = Stage(stats, stats_query)
+
+print()
+print('>>> STEP 1: PSYCHOLOGY AGENT (Research Methodologies)')
+print('-' * 70)
+psych_response = psych_stream.result()
+print(psych_response)
+
+print()
+print('>>> STEP 2: APPLICATIONS AGENT (Industry Use Cases)')
+print('-' * 70)
+apps_response = apps_stream.result()
+print(apps_response)
+
+print()
+print('>>> STEP 3: PRODUCT MANAGER AGENT (Product Strategy)')
+print('-' * 70)
+pm_response = pm_stream.result()
+print(pm_response)
+
+print()
+print('>>> STEP 4: STATISTICS AGENT (Experimentation Framework)')
+print('-' * 70)
+stats_response = stats_stream.result()
 print(stats_response)
 
 print()
@@ -146,18 +179,13 @@ print('PSYCHOLOGY → E-COMMERCE PIPELINE COMPLETE')
 print('=' * 70)
 
 # Save responses for document generation
+sections = [
+    ("PSYCHOLOGY AGENT OUTPUT", psych_response),
+    ("APPLICATIONS AGENT OUTPUT", apps_response),
+    ("PRODUCT MANAGER AGENT OUTPUT", pm_response),
+    ("STATISTICS AGENT OUTPUT", stats_response),
+]
 with open('docs/psychology_pipeline_output.txt', 'w') as f:
-    f.write("PSYCHOLOGY AGENT OUTPUT:\n")
-    f.write("=" * 50 + "\n")
-    f.write(psych_response + "\n\n")
-    f.write("APPLICATIONS AGENT OUTPUT:\n")
-    f.write("=" * 50 + "\n")
-    f.write(apps_response + "\n\n")
-    f.write("PRODUCT MANAGER AGENT OUTPUT:\n")
-    f.write("=" * 50 + "\n")
-    f.write(pm_response + "\n\n")
-    f.write("STATISTICS AGENT OUTPUT:\n")
-    f.write("=" * 50 + "\n")
-    f.write(stats_response + "\n")
+    f.write("\n".join(f"{title}:\n{'=' * 50}\n{body}\n" for title, body in sections))
 
 print("\n✓ Pipeline output saved to: docs/psychology_pipeline_output.txt")
@@ -17,6 +17,9 @@ class ResearchState(TypedDict):
         documents: Retrieved/searched documents for grounding
         web_search_needed: Flag indicating if web search fallback is needed
         synthesis: Combined response from multiple agents
+        formatted_documents: documents as formatted for synthesis ("" until synthesized
+            or after web_search adds documents)
+        formatted_agent_responses: agent_responses as formatted for synthesis ("" until synthesized)
         hallucination_grade: "grounded" or "not_grounded"
         answer_grade: "useful" or "not_useful"
         iteration_count: Retry counter (max 3)
@@ -30,6 +33,8 @@ class ResearchState(TypedDict):
     documents: List[Document]
     web_search_needed: bool
     synthesis: str
+    formatted_documents: str
+    formatted_agent_responses: str
     hallucination_grade: str
     answer_grade: str
     iteration_count: int
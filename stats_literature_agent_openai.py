@@ -1,18 +1,35 @@
 #!/usr/bin/env python3
 """
-Statistics Literature Review Agent (OpenAI GPT-4 Version)
+Statistics Literature Review Agent (OpenAI Version)
 
 An interactive agent that helps researchers find and summarize
-academic papers in Statistics using GPT-4.
+academic papers in Statistics using GPT-4o and GPT-4o-mini.
 """
 
 import json
-import os
-from openai import OpenAI
-from duckduckgo_search import DDGS
-
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.llm_cache import cached_chat, cached_chat_stream, enable_response_cache
+from agents.openai_client import get_openai_client
+from agents.search_cache import ddgs_text
+from agents.streaming import flushing_writer
+
+# Shared pooled client (HTTP/2 when h2 is installed)
+client = get_openai_client()
+
+# Turns that only decide which searches to run go to the small model; the
+# turn that reads search results and writes the answer gets the larger one.
+DISPATCH_MODEL = "gpt-4o-mini"
+SYNTHESIS_MODEL = "gpt-4o"
+
+# Every message is appended to HISTORY_PATH; only the last HISTORY_WINDOW
+# are sent with each request, plus a recap of the questions dropped before them.
+HISTORY_PATH = "conversation_history.jsonl"
+HISTORY_WINDOW = 20
+RECAP_HEADER = "Earlier questions in this session (their answers are no longer shown):"
+RECAP_LIMIT = 10
 
 SYSTEM_PROMPT = """You are an expert Statistics literature review assistant.
 Your role is to help researchers find, analyze, and summarize academic papers in Statistics.
@@ -63,8 +80,7 @@ TOOLS = [
 def web_search(query: str) -> str:
     """Perform a web search using DuckDuckGo."""
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=8))
+        results = ddgs_text(query, max_results=8)
 
         if not results:
             return "No results found."
@@ -82,53 +98,105 @@ def web_search(query: str) -> str:
 
 
 def process_tool_calls(tool_calls):
-    """Process tool calls and return results."""
-    results = []
-    for tool_call in tool_calls:
-        if tool_call.function.name == "web_search":
-            args = json.loads(tool_call.function.arguments)
-            result = web_search(args["query"])
-            results.append({
-                "tool_call_id": tool_call.id,
-                "role": "tool",
-                "content": result
-            })
-    return results
-
-
-def chat(user_message: str, conversation_history: list) -> str:
-    """Send a message and get a response, handling tool calls."""
+    """Process tool calls and return results, running parallel searches concurrently."""
+    searches = [tc for tc in tool_calls if tc.function.name == "web_search"]
+    queries = [json.loads(tc.function.arguments)["query"] for tc in searches]
+    if len(queries) > 1:
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            outputs = list(pool.map(web_search, queries))
+    else:
+        outputs = [web_search(q) for q in queries]
+
+    return [
+        {
+            "tool_call_id": tool_call.id,
+            "role": "tool",
+            "content": result
+        }
+        for tool_call, result in zip(searches, outputs)
+    ]
+
+
+def append_history(path: str, messages: list):
+    """Append messages to the session log, one JSON object per line."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(message) + "\n" for message in messages)
+
 
+def load_history(path: str, window: int = HISTORY_WINDOW) -> list:
+    """The last window messages of a saved session, starting at a user turn."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            tail = deque((json.loads(line) for line in f if line.strip()), maxlen=window)
+    except FileNotFoundError:
+        return []
+    messages = list(tail)
+    start = next((i for i, m in enumerate(messages) if m["role"] == "user"), len(messages))
+    return messages[start:]
+
+
+def trim_history(conversation_history: list, window: int = HISTORY_WINDOW):
+    """
+    Drop old turns so about window messages follow the system prompt.
+
+    Cuts only before a user message, so tool results stay with the call
+    that asked for them. Dropped questions are listed in a recap message
+    right after the system prompt.
+    """
+    has_recap = len(conversation_history) > 1 and conversation_history[1]["role"] == "system"
+    body = conversation_history[2 if has_recap else 1:]
+    if len(body) <= window:
+        return
+    user_turns = [i for i, m in enumerate(body) if m["role"] == "user"]
+    cut = next((i for i in user_turns if i >= len(body) - window), user_turns[-1] if user_turns else 0)
+    if cut == 0:
+        return
+    questions = conversation_history[1]["content"].splitlines()[1:] if has_recap else []
+    questions += [
+        "- " + " ".join(m["content"].split())[:200] for m in body[:cut] if m["role"] == "user"
+    ]
+    recap = {"role": "system", "content": "\n".join([RECAP_HEADER] + questions[-RECAP_LIMIT:])}
+    conversation_history[1:] = [recap] + body[cut:]
+
+
+def pick_model(conversation_history: list) -> str:
+    """Synthesis model if the last message is a tool result, else the dispatch model."""
+    if conversation_history[-1]["role"] == "tool":
+        return SYNTHESIS_MODEL
+    return DISPATCH_MODEL
+
+
+def chat(user_message: str, conversation_history: list, on_text=None) -> str:
+    """
+    Send a message and get a response, handling tool calls.
+
+    If on_text is given, the response is streamed to it as it is generated.
+    """
+
+    # The system prompt lives at the head of the history, so each request
+    # sends the history list as-is instead of rebuilding it.
+    if not conversation_history or conversation_history[0]["role"] != "system":
+        conversation_history.insert(0, {"role": "system", "content": SYSTEM_PROMPT})
     conversation_history.append({"role": "user", "content": user_message})
 
     while True:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "system", "content": SYSTEM_PROMPT}] + conversation_history,
+        request = dict(
+            model=pick_model(conversation_history),
+            messages=conversation_history,
             tools=TOOLS,
             tool_choice="auto"
         )
+        if on_text is None:
+            response = cached_chat(client, **request)
+        else:
+            response = cached_chat_stream(client, on_text, **request)
 
         message = response.choices[0].message
 
         # Check if the model wants to use tools
         if message.tool_calls:
             # Add assistant's message with tool calls to history
-            conversation_history.append({
-                "role": "assistant",
-                "content": message.content,
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments
-                        }
-                    }
-                    for tc in message.tool_calls
-                ]
-            })
+            conversation_history.append(message.model_dump(include={"role", "content", "tool_calls"}))
 
             # Process tools and add results
             tool_results = process_tool_calls(message.tool_calls)
@@ -146,16 +214,26 @@ def main():
     """Run the interactive literature review agent."""
 
     print("=" * 60)
-    print("  Statistics Literature Review Agent (GPT-4)")
+    print("  Statistics Literature Review Agent (GPT-4o)")
     print("=" * 60)
     print("\nI can help you find and summarize statistics papers.")
     print("Examples:")
     print("  - 'Find recent papers on Bayesian optimization'")
     print("  - 'What are the key papers on causal inference?'")
     print("  - 'Summarize methods for high-dimensional regression'")
-    print("\nType 'quit' or 'exit' to end the session.\n")
+    print("\nType 'quit' or 'exit' to end the session.")
+    print("Run with --resume to pick up where the last session left off,")
+    print("or --cache to replay stored answers to repeated questions.\n")
 
-    conversation_history = []
+    # Off by default: in a live session a repeated question should get a fresh
+    # answer. --cache replays stored completions for identical requests.
+    if '--cache' in sys.argv[1:]:
+        cache = enable_response_cache()
+        print(f"Response cache on ({cache.path}): repeated questions replay stored answers.\n")
+
+    conversation_history = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if '--resume' in sys.argv[1:]:
+        conversation_history += load_history(HISTORY_PATH)
 
     while True:
         try:
@@ -173,12 +251,18 @@ def main():
 
         print("\nSearching and analyzing...\n")
 
+        start = len(conversation_history)
         try:
-            response = chat(user_input, conversation_history)
-            print(response)
+            chat(user_input, conversation_history, on_text=flushing_writer())
         except Exception as e:
+            # Drop the failed turn so memory matches the log written so far
+            del conversation_history[start:]
             print(f"Error: {e}")
             print("Please check your API key and try again.")
+        else:
+            print(flush=True)
+            append_history(HISTORY_PATH, conversation_history[start:])
+            trim_history(conversation_history)
 
 
 if __name__ == "__main__":
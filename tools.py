@@ -1,9 +1,59 @@
 """Web search and retrieval tools for the research agent."""
 
 import os
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from operator import itemgetter
+from typing import List, Optional, Sequence
 from langchain_core.documents import Document
-from duckduckgo_search import DDGS
+
+from agents.search_cache import ddgs_text, search_cache
+
+# Sites queried by academic_search / industry_search, one DuckDuckGo query each
+ACADEMIC_SITES = (
+    "arxiv.org",
+    "scholar.google.com",
+    "pubmed.ncbi.nlm.nih.gov",
+    "nature.com",
+    "sciencedirect.com",
+)
+INDUSTRY_SITES = (
+    "engineering.uber.com",
+    "research.google",
+    "ai.meta.com",
+    "github.com",
+    "towardsdatascience.com",
+    "medium.com",
+)
+
+
+_result_fields = itemgetter("title", "href", "body")
+
+
+def _to_documents(results: List[dict]) -> List[Document]:
+    """Convert DuckDuckGo result dicts to Documents."""
+    return [
+        Document(
+            page_content=f"Title: {title}\nURL: {url}\nSnippet: {body}",
+            metadata={
+                "title": title,
+                "url": url,
+                "source": "web_search"
+            }
+        )
+        for title, url, body in map(_result_fields, results)
+    ]
+
+
+def dedup_documents(documents: List[Document]) -> List[Document]:
+    """
+    Drop documents whose URL was already seen, keeping first occurrences in
+    order (so search ranking is preserved). Documents without a URL are kept.
+    """
+    unique = {}
+    for doc in documents:
+        unique.setdefault(doc.metadata.get("url") or id(doc), doc)
+    return list(unique.values())
 
 
 def web_search(query: str, max_results: int = 8) -> List[Document]:
@@ -18,36 +68,54 @@ def web_search(query: str, max_results: int = 8) -> List[Document]:
         List of Document objects with search results
     """
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
+        results = ddgs_text(query, max_results=max_results)
 
         if not results:
             return []
 
-        documents = []
-        for r in results:
-            content = f"Title: {r['title']}\nURL: {r['href']}\nSnippet: {r['body']}"
-            doc = Document(
-                page_content=content,
-                metadata={
-                    "title": r["title"],
-                    "url": r["href"],
-                    "source": "web_search"
-                }
-            )
-            documents.append(doc)
-
-        return documents
+        return dedup_documents(_to_documents(results))
 
     except Exception as e:
         print(f"Web search error: {e}")
         return []
 
 
+def _site_results(query: str, site: str, max_results: int) -> List[dict]:
+    """Raw DuckDuckGo results for query restricted to one site ([] on error)."""
+    try:
+        return ddgs_text(f"{query} site:{site}", max_results=max_results) or []
+    except Exception as e:
+        print(f"Web search error ({site}): {e}")
+        return []
+
+
+def multi_site_search(query: str, sites: Sequence[str], max_results: int = 8) -> List[Document]:
+    """
+    Search each site separately and merge the results.
+
+    The per-site queries run concurrently, so the search costs about one
+    round-trip instead of a single OR-joined query that DuckDuckGo tends to
+    answer poorly. Results are interleaved across sites (so every site is
+    represented), deduplicated by URL and truncated to max_results.
+    """
+    with ThreadPoolExecutor(max_workers=len(sites)) as pool:
+        per_site = list(pool.map(lambda site: _site_results(query, site, max_results), sites))
+
+    merged, seen = [], set()
+    for r in chain.from_iterable(zip_longest(*per_site)):
+        if r is None or r["href"] in seen:
+            continue
+        seen.add(r["href"])
+        merged.append(r)
+        if len(merged) >= max_results:
+            break
+    return _to_documents(merged)
+
+
 def academic_search(query: str, max_results: int = 8) -> List[Document]:
     """
     Perform an academic-focused web search.
-    Adds academic source modifiers to the query.
+    Queries each of ACADEMIC_SITES in parallel (see multi_site_search).
 
     Args:
         query: The search query
@@ -56,16 +124,14 @@ def academic_search(query: str, max_results: int = 8) -> List[Document]:
     Returns:
         List of Document objects with search results
     """
-    # Enhance query for academic sources
-    academic_query = f"{query} site:arxiv.org OR site:scholar.google.com OR site:pubmed.ncbi.nlm.nih.gov OR site:nature.com OR site:sciencedirect.com"
-
-    return web_search(academic_query, max_results)
+    return multi_site_search(query, ACADEMIC_SITES, max_results)
 
 
 def industry_search(query: str, max_results: int = 8) -> List[Document]:
     """
     Perform an industry/applications-focused web search.
-    Targets industry blogs and practical implementations.
+    Targets industry blogs and practical implementations, querying each of
+    INDUSTRY_SITES in parallel (see multi_site_search).
 
     Args:
         query: The search query
@@ -74,10 +140,7 @@ def industry_search(query: str, max_results: int = 8) -> List[Document]:
     Returns:
         List of Document objects with search results
     """
-    # Enhance query for industry sources
-    industry_query = f"{query} site:engineering.uber.com OR site:research.google OR site:ai.meta.com OR site:github.com OR site:towardsdatascience.com OR site:medium.com"
-
-    return web_search(industry_query, max_results)
+    return multi_site_search(query, INDUSTRY_SITES, max_results)
 
 
 def format_documents_for_context(documents: List[Document]) -> str:
@@ -93,11 +156,9 @@ def format_documents_for_context(documents: List[Document]) -> str:
     if not documents:
         return "No documents available."
 
-    formatted = []
-    for i, doc in enumerate(documents, 1):
-        formatted.append(f"[Document {i}]\n{doc.page_content}\n")
-
-    return "\n---\n".join(formatted)
+    return "\n---\n".join(
+        f"[Document {i}]\n{doc.page_content}\n" for i, doc in enumerate(documents, 1)
+    )
 
 
 def format_agent_responses(responses: dict) -> str:
@@ -113,11 +174,9 @@ def format_agent_responses(responses: dict) -> str:
     if not responses:
         return "No agent responses available."
 
-    formatted = []
-    for agent_name, response in responses.items():
-        formatted.append(f"[{agent_name}]\n{response}\n")
-
-    return "\n---\n".join(formatted)
+    return "\n---\n".join(
+        f"[{agent_name}]\n{response}\n" for agent_name, response in responses.items()
+    )
 
 
 # Optional: Tavily search integration (requires API key)
@@ -142,10 +201,13 @@ def tavily_search(query: str, max_results: int = 5) -> List[Document]:
         from tavily import TavilyClient
 
         client = TavilyClient(api_key=tavily_key)
-        response = client.search(query, max_results=max_results)
+        results = search_cache.fetch(
+            "tavily", query, max_results,
+            lambda: client.search(query, max_results=max_results).get("results", []),
+        )
 
         documents = []
-        for result in response.get("results", []):
+        for result in results:
             content = f"Title: {result['title']}\nURL: {result['url']}\nContent: {result['content']}"
             doc = Document(
                 page_content=content,